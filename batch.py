@@ -0,0 +1,88 @@
+"""
+Gardio Batch API
+Run one toolbox operation over many documents in a single call.
+"""
+import re
+from bisect import bisect_right
+from typing import Any, Callable, Dict, List, Optional
+
+import logic
+import executor
+from constants import RE_NUMBERS, RE_URLS, BATCH_MAX_DOCUMENTS, EXECUTOR_INLINE_CHARS, EXECUTOR_WORKERS
+
+# Tools callable as fn(document, **params)
+TOOLS: Dict[str, Callable[..., str]] = {
+    "analyze_text": logic.analyze_text,
+    "apply_rules": logic.apply_rules,
+    "count_frequency": logic.count_frequency,
+    "encode_decode": logic.encode_decode,
+    "extract_all": logic.extract_all,
+    "extract_numbers": logic.extract_numbers,
+    "extract_urls": logic.extract_urls,
+    "find_replace": logic.find_replace,
+    "format_json": logic.format_json,
+    "remove_duplicates": logic.remove_duplicates,
+    "text_to_dict": logic.text_to_dict,
+    "text_to_list": logic.text_to_list,
+    "text_to_tuple": logic.text_to_tuple,
+}
+
+def _bulk_findall(pattern: re.Pattern, sep: str) -> Callable[[List[str]], List[str]]:
+    """One regex pass over all documents joined by newlines.
+
+    The built-in patterns never match across a newline, so each match
+    belongs to exactly one document, found by bisecting the start offsets.
+    """
+    def run(docs: List[str]) -> List[str]:
+        starts, offset = [], 0
+        for doc in docs:
+            starts.append(offset)
+            offset += len(doc) + 1
+        found: List[List[str]] = [[] for _ in docs]
+        for m in pattern.finditer("\n".join(docs)):
+            found[bisect_right(starts, m.start()) - 1].append(m.group())
+        return [sep.join(items) for items in found]
+    return run
+
+# Vectorized implementations used when a tool takes no extra params
+BULK: Dict[str, Callable[[List[str]], List[str]]] = {
+    "extract_numbers": _bulk_findall(RE_NUMBERS, ", "),
+    "extract_urls": _bulk_findall(RE_URLS, "\n"),
+}
+
+def _run_local(tool: str, docs: List[str], params: Dict[str, Any]) -> List[str]:
+    if tool in BULK and not params: return BULK[tool](docs)
+    fn = TOOLS[tool]
+    return [fn(doc, **params) for doc in docs]
+
+def run_batch(tool: str, documents: List[str], params: Optional[Dict[str, Any]] = None,
+              parallel: bool = False) -> List[str]:
+    """Apply `tool` to every document and return results in input order.
+
+    Identical documents are computed once. With parallel=True, large
+    batches are split across the executor's process pool.
+    """
+    if tool not in TOOLS: raise ValueError(f"Unknown tool '{tool}'. Available: {', '.join(sorted(TOOLS))}")
+    if len(documents) > BATCH_MAX_DOCUMENTS: raise ValueError(f"Batch too large (max {BATCH_MAX_DOCUMENTS} documents)")
+    params = params or {}
+    docs = ["" if d is None else str(d) for d in documents]
+    unique = list(dict.fromkeys(docs))
+
+    pool = executor.start() if parallel and sum(map(len, unique)) >= EXECUTOR_INLINE_CHARS else None
+    if pool is None: results = _run_local(tool, unique, params)
+    else:
+        size = -(-len(unique) // EXECUTOR_WORKERS)
+        parts = [unique[i:i + size] for i in range(0, len(unique), size)]
+        results = [r for part in pool.map(_run_local, [tool] * len(parts), parts, [params] * len(parts)) for r in part]
+
+    lookup = dict(zip(unique, results))
+    return [lookup[d] for d in docs]
+
+def batch_api(tool: str, documents: List[str], params: Optional[Dict[str, Any]] = None,
+              parallel: bool = True) -> List[str]:
+    """Gradio endpoint wrapper: surfaces bad requests as UI/API errors."""
+    try:
+        return run_batch(tool, documents, params, parallel)
+    except (ValueError, TypeError) as e:
+        import gradio as gr
+        raise gr.Error(str(e))
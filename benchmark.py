@@ -0,0 +1,189 @@
+"""
+Gardio Benchmarks
+Throughput, latency percentiles and peak memory for every logic.py tool.
+
+Usage:
+    python benchmark.py                                  # 1KB..1MB, print table
+    python benchmark.py --sizes 1KB,1MB,100MB --output bench.json
+    python benchmark.py --save-baseline baseline.json
+    python benchmark.py --baseline baseline.json --threshold 0.25   # exit 1 on regression
+"""
+import sys
+import json
+import time
+import random
+import argparse
+import functools
+import platform
+import tracemalloc
+from statistics import median
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import logic
+import stats
+from constants import VERSION, MAX_TEXT_LENGTH
+
+DEFAULT_SIZES = "1KB,10KB,100KB,1MB"
+CAPPED = ("analyze_text", "count_frequency")  # validate_text() truncates their input to MAX_TEXT_LENGTH
+UNITS = {"KB": 1024, "MB": 1024 ** 2}
+WORDS = ("the quick brown fox jumps over lazy dog data latency turbo gradio text python "
+         "analysis token stream cache worker queue json diff encode").split()
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 📚 CORPORA
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def parse_size(label: str) -> int:
+    label = label.strip().upper()
+    for unit, factor in UNITS.items():
+        if label.endswith(unit): return int(float(label[:-len(unit)]) * factor)
+    return int(label)
+
+def make_text(size: int, seed: int = 42) -> str:
+    """Log-like prose with numbers, URLs, punctuation and repeated lines."""
+    rng = random.Random(seed)
+    lines: List[str] = []
+    for i in range(256):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(4, 14))]
+        if i % 5 == 0: words.append(f"https://example.com/item/{rng.randint(1, 999)}")
+        if i % 3 == 0: words.append(f"{rng.uniform(-500, 500):.2f}")
+        if i % 7 == 0: words.append(f"key{i}: value{i},")
+        lines.append(" ".join(words))
+    lines += lines[:64]  # ~20% duplicate lines
+    block = "\n".join(lines) + "\n"
+    return (block * (size // len(block) + 1))[:size]
+
+def make_json(size: int) -> str:
+    record = '{"id": %d, "name": "item-%d", "tags": ["a", "b"], "score": %d.5, "ok": true}'
+    parts, total, i = [], 2, 0
+    while total < size:
+        parts.append(record % (i, i, i))
+        total += len(parts[-1]) + 2
+        i += 1
+    return "[" + ", ".join(parts) + "]"
+
+def mutate(text: str, every: int = 50) -> str:
+    lines = text.splitlines()
+    for i in range(0, len(lines), every): lines[i] = lines[i][::-1]
+    return "\n".join(lines)
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# ⏱️ HARNESS
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def _raw(fn: Callable) -> Callable:
+    # Measure the work itself, not the result cache
+    return getattr(fn, "__wrapped__", fn)
+
+# One corpus of each kind is kept, so a size's cases share it and the previous size is freed
+_text = functools.lru_cache(maxsize=1)(make_text)
+_json = functools.lru_cache(maxsize=1)(make_json)
+_mutated = functools.lru_cache(maxsize=1)(lambda size: mutate(_text(size)))
+_RULES = [[w, w.upper()] for w in WORDS] + [[r"\d+\.\d+", "#", True, False]]
+
+# name -> (function, size -> arguments)
+CASES: Dict[str, Tuple[Callable, Callable[[int], tuple]]] = {
+    "stats_scan": (stats.scan, lambda n: (_text(n),)),  # The uncapped engine behind analyze/frequency
+    "analyze_text": (_raw(logic.analyze_text), lambda n: (_text(n),)),
+    "count_frequency": (_raw(logic.count_frequency), lambda n: (_text(n),)),
+    "diff_text": (_raw(logic.diff_text), lambda n: (_text(n), _mutated(n))),
+    "format_json": (_raw(logic.format_json), lambda n: (_json(n),)),
+    "encode_decode": (_raw(logic.encode_decode), lambda n: (_text(n), "Base64 Encode")),
+    "remove_duplicates": (logic.remove_duplicates, lambda n: (_text(n),)),
+    "extract_numbers": (logic.extract_numbers, lambda n: (_text(n),)),
+    "extract_urls": (logic.extract_urls, lambda n: (_text(n),)),
+    "extract_all": (logic.extract_all, lambda n: (_text(n),)),
+    "extract_num_url": (logic.extract_all, lambda n: (_text(n), ["number", "url"])),  # vs extract_numbers + extract_urls
+    "find_replace": (logic.find_replace, lambda n: (_text(n), "the", "THE")),
+    "apply_rules": (logic.apply_rules, lambda n: (_text(n), _RULES)),
+    "text_to_list": (logic.text_to_list, lambda n: (_text(n),)),
+    "text_to_tuple": (logic.text_to_tuple, lambda n: (_text(n),)),
+    "text_to_dict": (logic.text_to_dict, lambda n: (_text(n),)),
+    "chat_respond": (logic.chat_respond, lambda n: (_text(n)[:200], "benchmark")),
+}
+
+def cases(size: int, tools: Sequence[str] = ()) -> Dict[str, Tuple[Callable, tuple]]:
+    """Cases at `size`; corpora are only generated for the selected tools."""
+    return {name: (fn, build(size)) for name, (fn, build) in CASES.items() if not tools or name in tools}
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def measure(fn: Callable, args: tuple, min_time: float, max_runs: int) -> Dict[str, float]:
+    fn(*args)  # Warm-up (imports, regex compilation)
+    samples: List[float] = []
+    started = time.perf_counter()
+    while len(samples) < max_runs and (len(samples) < 3 or time.perf_counter() - started < min_time):
+        t0 = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"runs": len(samples), "p50_ms": median(samples) * 1000,
+            "p99_ms": percentile(samples, 99) * 1000, "peak_kb": peak / 1024}
+
+def run(sizes: List[str], tools: List[str], min_time: float, max_runs: int) -> dict:
+    results = []
+    for label in sizes:
+        size = parse_size(label)
+        for name, (fn, args) in cases(size, tools).items():
+            result = measure(fn, args, min_time, max_runs)
+            input_bytes = sum(len(a) for a in args if isinstance(a, str))
+            # Throughput counts only what the tool actually read
+            processed = min(input_bytes, MAX_TEXT_LENGTH) if name in CAPPED else input_bytes
+            result.update(tool=name, size=label, bytes=input_bytes, processed_bytes=processed,
+                          mb_per_s=processed / 1024 ** 2 / (result["p50_ms"] / 1000) if result["p50_ms"] else 0.0,
+                          capped=processed < input_bytes)
+            results.append(result)
+            print(f"{name:<18} {label:>6}  p50 {result['p50_ms']:9.3f} ms  p99 {result['p99_ms']:9.3f} ms  "
+                  f"{result['mb_per_s']:8.1f} MB/s  peak {result['peak_kb']:10.1f} KB"
+                  f"{'  (capped)' if result['capped'] else ''}", flush=True)
+    return {"version": VERSION, "python": platform.python_version(), "machine": platform.machine(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": results}
+
+def compare(current: dict, baseline: dict, threshold: float) -> List[str]:
+    """Return one message per (tool, size) whose p50 regressed beyond `threshold`."""
+    before = {(r["tool"], r["size"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for r in current["results"]:
+        old = before.get((r["tool"], r["size"]))
+        if not old or not old["p50_ms"]: continue
+        change = r["p50_ms"] / old["p50_ms"] - 1
+        if change > threshold:
+            regressions.append(f"{r['tool']} @ {r['size']}: p50 {old['p50_ms']:.3f} -> {r['p50_ms']:.3f} ms (+{change:.0%})")
+    return regressions
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Gardio tools")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma-separated corpus sizes, e.g. 1KB,1MB,100MB")
+    parser.add_argument("--tools", default="", help="Comma-separated tool names (default: all)")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Seconds to sample each case")
+    parser.add_argument("--max-runs", type=int, default=200)
+    parser.add_argument("--output", help="Write results JSON here")
+    parser.add_argument("--save-baseline", help="Write results JSON as the new baseline")
+    parser.add_argument("--baseline", help="Compare against this baseline JSON")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed p50 slowdown (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    tools = [t.strip() for t in args.tools.split(",") if t.strip()]
+    # A typo must not turn into an empty run that passes the regression gate
+    unknown = [t for t in tools if t not in CASES]
+    if unknown: parser.error(f"unknown --tools: {', '.join(unknown)} (choose from {', '.join(CASES)})")
+    report = run([s.strip() for s in args.sizes.split(",") if s.strip()], tools, args.min_time, args.max_runs)
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f: json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f: regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) over {args.threshold:.0%}:", file=sys.stderr)
+            for line in regressions: print(f"  {line}", file=sys.stderr)
+            return 1
+        print(f"\n✅ No regressions over {args.threshold:.0%}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""
+Gardio Result Cache
+Content-addressed memoization with a byte budget, LRU eviction and TTL.
+"""
+import sys
+import time
+import threading
+import functools
+from hashlib import blake2b
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
+
+from constants import CACHE_MAX_BYTES, CACHE_MAX_ITEM_BYTES, CACHE_TTL
+
+_MISSING = object()
+
+def make_key(tool: str, args: Tuple, kwargs: Dict[str, Any]) -> bytes:
+    """Hash (tool, inputs) without building a repr of large strings."""
+    h = blake2b(tool.encode(), digest_size=16)
+    for value in (*args, *sorted(kwargs.items())):
+        if isinstance(value, str): data = value.encode("utf-8", "surrogatepass")
+        elif isinstance(value, bytes): data = value
+        else: data = repr(value).encode()
+        # Type tag + length prefix keeps ("ab", "c") distinct from ("a", "bc")
+        h.update(f"|{type(value).__name__}:{len(data)}|".encode())
+        h.update(data)
+    return h.digest()
+
+def sizeof(value: Any) -> int:
+    if isinstance(value, (tuple, list)): return sys.getsizeof(value) + sum(sizeof(v) for v in value)
+    return sys.getsizeof(value)
+
+class ResultCache:
+    """Thread-safe LRU cache bounded by total result size in bytes."""
+
+    def __init__(self, max_bytes: int = CACHE_MAX_BYTES, ttl: float = CACHE_TTL,
+                 max_item_bytes: int = CACHE_MAX_ITEM_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.max_item_bytes = min(max_item_bytes, max_bytes)
+        self._data: "OrderedDict[bytes, Tuple[float, int, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def get(self, key: bytes, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            stamp, size, value = entry
+            if self.ttl and time.monotonic() - stamp > self.ttl:
+                del self._data[key]
+                self.bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: bytes, value: Any) -> None:
+        size = sizeof(value)
+        if size > self.max_item_bytes: return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old: self.bytes -= old[1]
+            self._data[key] = (time.monotonic(), size, value)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted, _) = self._data.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._data), "bytes": self.bytes, "max_bytes": self.max_bytes,
+                "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "expirations": self.expirations}
+
+# Shared by every server-side tool so the byte budget covers the whole worker
+RESULTS = ResultCache()
+
+def memoize(tool: str, store: ResultCache = RESULTS) -> Callable[[Callable], Callable]:
+    """Decorator: cache results of a pure tool function keyed by its inputs."""
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = make_key(tool, args, kwargs)
+            result = store.get(key, _MISSING)
+            if result is _MISSING:
+                result = fn(*args, **kwargs)
+                store.put(key, result)
+            return result
+        wrapper.tool = tool
+        wrapper.cache = store
+        return wrapper
+    return decorator
+
+def memoize_stream(tool: str, store: ResultCache = RESULTS) -> Callable[[Callable], Callable]:
+    """Decorator for generator tools: the final update is cached and a hit yields it once.
+
+    Streams that stop early (client disconnect) are not stored.
+    """
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = make_key(tool, args, kwargs)
+            result = store.get(key, _MISSING)
+            if result is not _MISSING:
+                yield result
+                return
+            for result in fn(*args, **kwargs): yield result
+            if result is not _MISSING: store.put(key, result)
+        wrapper.tool = tool
+        wrapper.cache = store
+        return wrapper
+    return decorator
+
+def memoize_live(tool: str, store: ResultCache = RESULTS) -> Callable[[Callable], Callable]:
+    """Decorator for live `(text, state) -> (result, state)` handlers, keyed by text alone.
+
+    On a hit the state passes through untouched: it still describes the text it
+    last saw, so the next incremental update diffs against that and stays correct.
+    """
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(text, state):
+            key = make_key(tool, (text,), {})
+            result = store.get(key, _MISSING)
+            if result is not _MISSING: return result, state
+            result, state = fn(text, state)
+            store.put(key, result)
+            return result, state
+        wrapper.tool = tool
+        wrapper.cache = store
+        return wrapper
+    return decorator
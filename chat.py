@@ -0,0 +1,99 @@
+"""
+Gardio Chat
+Compiled intent matching and a bounded, server-side per-session history.
+"""
+import re
+import time
+import random
+import threading
+from datetime import datetime
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from constants import (CHAT_INTENTS, CHAT_HISTORY_MESSAGES, CHAT_MAX_SESSIONS, CHAT_IDLE_TTL,
+                       JOKES, QUOTES, VERSION)
+
+class IntentMatcher:
+    """One alternation over every keyword; earlier intents win ties."""
+
+    def __init__(self, intents: Dict[str, List[str]]) -> None:
+        self.names = list(intents)
+        groups = "|".join(f"(?P<i{i}>{'|'.join(map(re.escape, sorted(words, key=len, reverse=True)))})"
+                          for i, words in enumerate(intents.values()))
+        self.pattern = re.compile(rf"\b(?:{groups})\b", re.IGNORECASE)
+
+    def match(self, text: str) -> Optional[str]:
+        best = None
+        for m in self.pattern.finditer(text):
+            rank = m.lastindex - 1
+            if best is None or rank < best:
+                best = rank
+                if rank == 0: break
+        return None if best is None else self.names[best]
+
+INTENTS = IntentMatcher(CHAT_INTENTS)
+
+REPLIES: Dict[str, Callable[[], str]] = {
+    "greet": lambda: "Hello! 👋",
+    "hola": lambda: "¡Hola! 👋",
+    "bonjour": lambda: "Bonjour! 👋",
+    "namaste": lambda: "नमस्ते! 🙏",
+    "version": lambda: f"📦 **Gardio v{VERSION}**\n• Gradio 6.1.0\n• Python 3.10+",
+    "help": lambda: "**Commands:** hello, version, time, date, joke, quote, tips, bye",
+    "time": lambda: f"🕐 **{datetime.now().strftime('%H:%M:%S')}**",
+    "date": lambda: f"📅 **{datetime.now().strftime('%A, %B %d, %Y')}**",
+    "joke": lambda: random.choice(JOKES),
+    "quote": lambda: random.choice(QUOTES),
+    "tips": lambda: "💡 Try the new JSON Formatter and Turbo tools!",
+    "bye": lambda: "Bye! Come back soon 👋",
+}
+
+def reply(message: str) -> str:
+    intent = INTENTS.match(message)
+    return REPLIES[intent]() if intent in REPLIES else "🤔 Try 'help' for commands!"
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 🗄️ SESSIONS
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+class SessionStore:
+    """session -> ring buffer of messages; idle and least-recent sessions are evicted."""
+
+    def __init__(self, max_messages: int = CHAT_HISTORY_MESSAGES, max_sessions: int = CHAT_MAX_SESSIONS,
+                 idle_ttl: float = CHAT_IDLE_TTL) -> None:
+        self.max_messages = max_messages
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self._sessions: "OrderedDict[str, Tuple[float, Deque[dict]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def _evict(self, now: float) -> None:
+        # Oldest activity first, so stop at the first session still live
+        while self._sessions:
+            session, (seen, _) = next(iter(self._sessions.items()))
+            if len(self._sessions) <= self.max_sessions and now - seen < self.idle_ttl: break
+            del self._sessions[session]
+            self.evictions += 1
+
+    def append(self, session: str, *messages: dict) -> None:
+        now = time.monotonic()
+        with self._lock:
+            _, history = self._sessions.pop(session, (now, None))
+            if history is None: history = deque(maxlen=self.max_messages)
+            history.extend(messages)
+            self._sessions[session] = (now, history)
+            self._evict(now)
+
+    def history(self, session: str) -> List[dict]:
+        with self._lock:
+            entry = self._sessions.get(session)
+            return list(entry[1]) if entry else []
+
+    def clear(self, session: str) -> None:
+        with self._lock: self._sessions.pop(session, None)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+STORE = SessionStore()
@@ -0,0 +1,206 @@
+"""
+Gardio Codec Pipeline
+Chained, chunked encoders/decoders; stages pull bytes lazily from each other,
+so no full intermediate is built between steps.
+"""
+import re
+import zlib
+import base64
+import binascii
+import codecs
+import urllib.parse
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Union
+
+import jsonstream
+from constants import CODEC_CHUNK_SIZE, CODEC_MAX_OUTPUT
+
+Stage = Callable[[Iterable[bytes]], Iterator[bytes]]
+
+class CodecError(ValueError):
+    """A stage rejected its input; `offset` is a byte offset into that stage's input."""
+
+    def __init__(self, stage: str, offset: int, reason: str, exact: bool = True) -> None:
+        # Structural errors are only located to the block they were found in
+        super().__init__(f"{stage}: {reason} {'at' if exact else 'near'} byte {offset}")
+        self.stage, self.offset, self.reason, self.exact = stage, offset, reason, exact
+
+_WHITESPACE = re.compile(rb"\s+")
+
+def _quanta(chunks: Iterable[bytes], quantum: int) -> Iterator[bytes]:
+    """Re-cut a stream into whole multiples of `quantum` (remainder last)."""
+    pending = b""
+    for chunk in chunks:
+        data = pending + chunk if pending else chunk
+        cut = len(data) - len(data) % quantum
+        pending = data[cut:]
+        if cut: yield data[:cut]
+    if pending: yield pending
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 🔤 TEXT ALPHABETS
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def _b64decode(data: bytes) -> bytes:
+    try: return binascii.a2b_base64(data, strict_mode=True)
+    except TypeError: return base64.b64decode(data, validate=True)  # Python < 3.11
+
+def _encoder(fn: Callable[[bytes], bytes], quantum: int) -> Stage:
+    def stage(chunks: Iterable[bytes]) -> Iterator[bytes]:
+        for block in _quanta(chunks, quantum): yield fn(block)
+    return stage
+
+def _decoder(name: str, fn: Callable[[bytes], bytes], quantum: int, invalid: bytes) -> Stage:
+    """Validate characters (exact offsets), drop whitespace, decode whole quanta."""
+    bad = re.compile(invalid)
+
+    def stage(chunks: Iterable[bytes]) -> Iterator[bytes]:
+        offset, pending = 0, b""
+        for chunk in chunks:
+            m = bad.search(chunk)
+            if m: raise CodecError(name, offset + m.start(), f"invalid character {chr(chunk[m.start()])!r}")
+            data = pending + _WHITESPACE.sub(b"", chunk)
+            cut = len(data) - len(data) % quantum
+            pending = data[cut:]
+            if cut:
+                try: yield fn(data[:cut])
+                except (binascii.Error, ValueError) as e: raise CodecError(name, offset, str(e), exact=False) from None
+            offset += len(chunk)
+        if pending:
+            try: yield fn(pending)
+            except (binascii.Error, ValueError): raise CodecError(name, offset, "truncated input") from None
+    return stage
+
+def _url_decode(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    # Hold back a trailing "%" or "%X" so escapes are never split
+    pending = b""
+    for chunk in chunks:
+        data = pending + chunk
+        cut = data.rfind(b"%", max(len(data) - 2, 0))
+        if cut == -1: cut = len(data)
+        pending = data[cut:]
+        if cut: yield urllib.parse.unquote_to_bytes(data[:cut])
+    if pending: yield urllib.parse.unquote_to_bytes(pending)
+
+def _url_encode(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    for chunk in chunks: yield urllib.parse.quote_from_bytes(chunk, safe="/").encode("ascii")
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 🗜️ COMPRESSION
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def _compress(wbits: int) -> Stage:
+    def stage(chunks: Iterable[bytes]) -> Iterator[bytes]:
+        c = zlib.compressobj(wbits=wbits)
+        for chunk in chunks:
+            out = c.compress(chunk)
+            if out: yield out
+        yield c.flush()
+    return stage
+
+def _decompress(name: str, wbits: int, members: bool) -> Stage:
+    """Inflate with bounded steps; gzip may hold several concatenated members.
+
+    Inflated bytes are capped here too, since a later stage (e.g. re-compression)
+    can shrink them again before the pipeline's final output check.
+    """
+    def stage(chunks: Iterable[bytes]) -> Iterator[bytes]:
+        d, offset, total = zlib.decompressobj(wbits=wbits), 0, 0
+        for chunk in chunks:
+            data = chunk
+            while data:
+                if d.eof:
+                    if not members: raise CodecError(name, offset + len(chunk) - len(data), "trailing data after end of stream")
+                    d = zlib.decompressobj(wbits=wbits)
+                try: out = d.decompress(data, CODEC_CHUNK_SIZE)
+                except zlib.error as e: raise CodecError(name, offset, str(e), exact=False) from None
+                total += len(out)
+                if total > CODEC_MAX_OUTPUT: raise CodecError(name, offset, f"inflates past {CODEC_MAX_OUTPUT:,} bytes", exact=False)
+                if out: yield out
+                data = d.unconsumed_tail or d.unused_data
+            offset += len(chunk)
+        out = d.flush()
+        if total + len(out) > CODEC_MAX_OUTPUT: raise CodecError(name, offset, f"inflates past {CODEC_MAX_OUTPUT:,} bytes", exact=False)
+        if out: yield out
+        if not d.eof: raise CodecError(name, offset, "truncated stream")
+    return stage
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 📝 JSON
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def _texts(name: str, chunks: Iterable[bytes]) -> Iterator[str]:
+    decoder, offset = codecs.getincrementaldecoder("utf-8")(), 0
+    for chunk in chunks:
+        try: yield decoder.decode(chunk)
+        except UnicodeDecodeError as e: raise CodecError(name, offset + e.start, "invalid UTF-8") from None
+        offset += len(chunk)
+    try: yield decoder.decode(b"", final=True)
+    except UnicodeDecodeError: raise CodecError(name, offset, "truncated UTF-8 sequence") from None
+
+def _json(mode: str) -> Stage:
+    def stage(chunks: Iterable[bytes]) -> Iterator[bytes]:
+        indent, sort_keys = jsonstream.MODES[mode]
+        name = f"JSON {mode}"
+        try:
+            for piece in jsonstream.reformat(_texts(name, chunks), indent, sort_keys): yield piece.encode("utf-8")
+        except jsonstream.JSONStreamError as e: raise CodecError(name, e.pos, f"{e.msg} (line {e.lineno} column {e.colno})", exact=False) from None
+    return stage
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 🔗 PIPELINE
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+STAGES: Dict[str, Stage] = {
+    "Base64 Encode": _encoder(base64.b64encode, 3),
+    "Base64 Decode": _decoder("Base64 Decode", _b64decode, 4, rb"[^A-Za-z0-9+/=\s]"),
+    "Base32 Encode": _encoder(base64.b32encode, 5),
+    "Base32 Decode": _decoder("Base32 Decode", base64.b32decode, 8, rb"[^A-Z2-7=\s]"),
+    "Base85 Encode": _encoder(base64.b85encode, 4),
+    "Base85 Decode": _decoder("Base85 Decode", base64.b85decode, 5, rb"[^0-9A-Za-z!#$%&()*+\-;<=>?@^_`{|}~\s]"),
+    "Hex Encode": _encoder(binascii.hexlify, 1),
+    "Hex Decode": _decoder("Hex Decode", binascii.unhexlify, 2, rb"[^0-9A-Fa-f\s]"),
+    "URL Encode": _url_encode,
+    "URL Decode": _url_decode,
+    "Gzip Compress": _compress(31),
+    "Gzip Decompress": _decompress("Gzip Decompress", 31, members=True),
+    "Zlib Compress": _compress(15),
+    "Zlib Decompress": _decompress("Zlib Decompress", 15, members=False),
+    "JSON Pretty": _json("Pretty"),
+    "JSON Minify": _json("Minify"),
+}
+
+_ALIASES = {"gunzip": "Gzip Decompress", "json": "JSON Pretty", "url": "URL Encode"}
+
+def resolve(name: str) -> str:
+    """Stage name from a label or shorthand ("gzip", "base64 decode", "unhex")."""
+    key = " ".join(name.replace("-", " ").replace("_", " ").lower().split())
+    if key in _ALIASES: return _ALIASES[key]
+    if key.startswith("un"): key = key[2:] + " decode"
+    lookup = {label.lower(): label for label in STAGES}
+    for candidate in (key, f"{key} encode", f"{key} compress", key.replace("decode", "decompress")):
+        if candidate in lookup: return lookup[candidate]
+    raise ValueError(f"Unknown codec '{name.strip()}'")
+
+def parse_chain(chain: Union[str, Sequence[str]]) -> List[str]:
+    """'gzip → base64', 'url decode, base64 decode, json' or a list of names."""
+    parts = re.split(r"→|->|,|\|", chain) if isinstance(chain, str) else chain
+    names = [resolve(p) for p in parts if p and p.strip()]
+    if not names: raise ValueError("Empty codec chain")
+    return names
+
+def chunked(data: bytes, size: int = CODEC_CHUNK_SIZE) -> Iterator[bytes]:
+    view = memoryview(data)
+    for i in range(0, len(data), size): yield bytes(view[i:i + size])
+
+def pipeline(chunks: Iterable[bytes], chain: Union[str, Sequence[str]]) -> Iterator[bytes]:
+    """Run `chunks` through every stage in order; output is capped at CODEC_MAX_OUTPUT."""
+    stream: Iterable[bytes] = chunks
+    for name in parse_chain(chain): stream = STAGES[name](stream)
+    total = 0
+    for piece in stream:
+        total += len(piece)
+        if total > CODEC_MAX_OUTPUT: raise CodecError("Output", total, f"exceeds {CODEC_MAX_OUTPUT:,} bytes")
+        yield piece
+
+def convert(data: bytes, chain: Union[str, Sequence[str]]) -> bytes:
+    return b"".join(pipeline(chunked(data), chain))
@@ -1,7 +1,9 @@
 """
 Gardio Constants & Configuration
 """
+import os
 import re
+import tempfile
 
 VERSION = "2.3.0"
 DEBUG = False
@@ -12,9 +14,140 @@ STOP_WORDS = {
     "on", "for", "was", "with", "as", "be", "at", "by", "this"
 }
 
+# Analytics
+MAX_TEXT_LENGTH = 50000         # Textbox input cap (see logic.validate_text)
+WORDS_PER_MINUTE = 200          # Reading speed for read-time estimates
+STATS_CHUNK_SIZE = 1 << 20      # Chunk size for streaming statistics
+TOP_KEYWORDS = 5
+
+# Corpus Analytics (see corpus.py); stop lists mask the index at query time, so switching never re-indexes
+_ENGLISH_STOP_WORDS = STOP_WORDS | {
+    "about", "above", "after", "again", "against", "all", "am", "an", "any", "are", "aren't", "because",
+    "been", "before", "being", "below", "between", "both", "but", "can", "can't", "could", "did", "didn't",
+    "do", "does", "doesn't", "doing", "don't", "down", "during", "each", "few", "from", "further", "had",
+    "has", "have", "having", "he", "her", "here", "hers", "herself", "him", "himself", "his", "how", "i'm",
+    "i've", "if", "into", "isn't", "it's", "its", "itself", "just", "me", "more", "most", "my", "myself",
+    "no", "nor", "not", "now", "off", "once", "only", "or", "other", "our", "ours", "ourselves", "out",
+    "over", "own", "same", "she", "should", "so", "some", "such", "than", "their", "theirs", "them",
+    "themselves", "then", "there", "these", "they", "those", "through", "too", "under", "until", "up",
+    "very", "we", "were", "what", "when", "where", "which", "while", "who", "whom", "why", "will", "won't",
+    "would", "you", "your", "yours", "yourself", "yourselves",
+}
+STOP_WORD_LISTS = {
+    "None": frozenset(),
+    "Basic": frozenset(STOP_WORDS),
+    "English": frozenset(_ENGLISH_STOP_WORDS),
+    # Ticket boilerplate that carries no topic
+    "Support": frozenset(_ENGLISH_STOP_WORDS | {
+        "hi", "hello", "hey", "dear", "team", "thanks", "thank", "thx", "please", "pls", "regards",
+        "cheers", "best", "sincerely", "kind", "let", "know", "get", "got", "also", "still", "would",
+        "issue", "problem", "help", "ticket", "support", "customer", "asap", "hope", "well",
+    }),
+}
+CORPUS_STOP_LIST = "English"
+CORPUS_SPLITS = ["Blank line", "Each line", "--- separator", "Each file"]
+CORPUS_MAX_DOCS = 50000          # Per session index
+CORPUS_MAX_CHARS = 32 << 20     # Characters ingested per Add
+CORPUS_KEYWORDS = 5             # TF-IDF keywords shown per document
+CORPUS_TOP_TERMS = 20           # Corpus-wide frequency list
+CORPUS_TABLE_ROWS = 1000        # Documents listed in the table
+CORPUS_MAX_FEATURES = 4096      # Similarity uses the shared terms with the highest document frequency
+CORPUS_SIM_CELLS = 1 << 24      # float32 cells in the dense similarity matrix (64 MB)
+CORPUS_SIM_BLOCK = 512          # Rows per similarity matmul block
+CORPUS_HEADERS = ["#", "Document", "Words", "Reading Ease", "Grade", "Keywords (TF-IDF)", "Most Similar", "Cosine"]
+
+# Result Cache (see cache.py)
+CACHE_MAX_BYTES = int(os.environ.get("GARDIO_CACHE_MB", "64")) * 1024 * 1024
+CACHE_MAX_ITEM_BYTES = 4 * 1024 * 1024   # Larger results are never cached
+CACHE_TTL = float(os.environ.get("GARDIO_CACHE_TTL", "600"))  # Seconds, 0 disables
+
+STREAM_INTERVAL = 0.25          # Seconds between streamed UI updates
+
+# Diff Engine (see diff.py)
+DIFF_CONTEXT = 3                # Context lines around each hunk
+DIFF_TIME_BUDGET = 2.0          # Seconds before falling back to coarse hunks
+DIFF_MAX_EDITS = 1000           # Myers edit-distance cap per unanchored region
+DIFF_STREAM_ROWS = 200          # Hunks shown in interim side-by-side updates
+
+# Execution Backend (see executor.py)
+EXECUTOR_WORKERS = int(os.environ.get("GARDIO_WORKERS", os.cpu_count() or 1))  # 0 runs everything inline
+EXECUTOR_INLINE_CHARS = 20000   # Smaller inputs skip the process pool
+EXECUTOR_QUEUE_LIMIT = 32       # Waiting calls per tool before rejecting
+EXECUTOR_TOOL_LIMITS = {"diff_stream": 2, "format_json": 2, "count_frequency": 4, "analyze_text": 4}
+
+# Batch API (see batch.py)
+BATCH_MAX_DOCUMENTS = 10000
+
+# Dedup Engine (see dedup.py)
+DEDUP_DIGEST_SIZE = 16          # Bytes per stored line digest (Bloom probes need 16)
+DEDUP_BLOOM_CAPACITY = 10_000_000
+DEDUP_FP_RATE = 0.001           # Chance a unique line is dropped in approximate mode
+DEDUP_OPTIONS = ["Ignore case", "Ignore whitespace", "Keep last", "Approximate (Bloom)"]
+
+# File Mode (see files.py)
+FILE_CHUNK_SIZE = 1 << 20       # Read/write buffer for uploaded files
+FILE_AVG_LINE_BYTES = 40        # Line-count estimate when sizing Bloom filters
+FILE_OUTPUT_DIR = os.path.join(tempfile.gettempdir(), "gardio_files")  # Results before Gradio caches them
+FILE_OUTPUT_TTL = 600           # Seconds a result is kept there; Gradio copies it as the handler returns
+FILE_CACHE_CLEANUP = (3600, 3600)  # Blocks delete_cache: (check every, delete older than) seconds
+FILE_TOOLS = ["Analyze", "Frequency", "Duplicates", "Numbers", "URLs", "Extract All", "Replace", "List"]
+
+# Streaming JSON (see jsonstream.py)
+JSON_FLUSH_PIECES = 4096        # Output tokens buffered per yielded batch
+JSON_STDLIB_CHARS = 1 << 20     # Smaller documents use json.loads/dumps: ~3x faster; numbers, escapes and duplicate keys are normalized
+JSON_MODES = ["Pretty", "Minify", "Sort Keys"]
+
 # Regex Patterns
 RE_NUMBERS = re.compile(r'-?\d+\.?\d*')
 RE_URLS = re.compile(r'https?://[^\s<>"{}|\\^`\[\]]+')
+RE_EMAILS = re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+')
+RE_IPV4 = re.compile(r'\b(?:(?:25[0-5]|2[0-4]\d|1?\d?\d)\.){3}(?:25[0-5]|2[0-4]\d|1?\d?\d)\b')
+RE_DATES = re.compile(r'\b(?:\d{4}-\d{2}-\d{2}|\d{1,2}/\d{1,2}/\d{2,4})\b')
+RE_HASHTAGS = re.compile(r'(?<![\w#])#\w+')
+
+# Replace Engine (see replace.py)
+REPLACE_HEADERS = ["Find", "Replace", "Regex", "Ignore case"]
+REPLACE_PREVIEW_LIMIT = 500     # Changed spans listed in preview mode
+
+# Extraction Engine (see extract.py); order sets priority when spans overlap
+EXTRACT_KINDS = ["url", "email", "ipv4", "date", "hashtag", "number"]
+EXTRACT_TIMEOUT = 2.0           # Seconds per scan when custom patterns are registered
+
+# Chat (see chat.py): intent -> keywords, in priority order; matched on word boundaries
+CHAT_INTENTS = {
+    "greet": ["hello", "hi", "hey"],
+    "hola": ["hola"],
+    "bonjour": ["bonjour"],
+    "namaste": ["namaste"],
+    "version": ["version"],
+    "help": ["help", "commands"],
+    "time": ["time"],
+    "date": ["date", "today"],
+    "joke": ["joke", "jokes"],
+    "quote": ["quote", "quotes"],
+    "tips": ["tip", "tips"],
+    "bye": ["bye", "goodbye"],
+}
+CHAT_HISTORY_MESSAGES = 100     # Ring buffer per session (user + assistant messages)
+CHAT_MAX_SESSIONS = 1000        # Least recently active sessions are evicted beyond this
+CHAT_IDLE_TTL = 1800            # Seconds before an idle session is dropped
+
+# Toolbox options (see registry.py)
+TRANSFORM_MODES = ["Reverse", "UPPERCASE", "lowercase", "Title Case", "Sentence Case", "No Spaces", "No Punctuation", "Shuffle Words"]
+STRING_OPS = ["Length", "Split (comma)", "Split (space)", "Join (-)", "Strip", "Is Alpha", "Is Digit", "Is Alnum"]
+ENCODER_MODES = ["Base64 Encode", "Base64 Decode", "URL Encode", "URL Decode", "Hex Encode", "Hex Decode",
+                 "Base32 Encode", "Base32 Decode", "Base85 Encode", "Base85 Decode", "Gzip Compress",
+                 "Gzip Decompress", "Zlib Compress", "Zlib Decompress", "JSON Pretty", "JSON Minify"]
+
+# Codec Pipeline (see codec.py)
+CODEC_CHUNK_SIZE = 1 << 16      # Bytes per chunk; stages re-cut to their own quanta
+CODEC_MAX_OUTPUT = 64 << 20     # Bytes; guards against decompression bombs
+
+# Metrics (see metrics.py)
+METRICS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # Seconds
+PROFILE_SAMPLE_RATE = float(os.environ.get("GARDIO_PROFILE_RATE", "0"))   # Fraction of calls run under cProfile
+PROFILE_KEEP = 10               # Slowest profiled calls retained
+STARTUP_PROFILE = os.environ.get("GARDIO_STARTUP_PROFILE", "") not in ("", "0")  # Print startup.report() at launch
 
 # Fun Data
 JOKES = [
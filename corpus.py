@@ -0,0 +1,292 @@
+"""
+Gardio Corpus Index
+An incremental vocabulary and sparse (CSR) term-document matrix over many
+documents; keywords, frequencies, readability and similarity are whole-array
+NumPy operations over it rather than per-document loops.
+"""
+import re
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from constants import (STOP_WORD_LISTS, CORPUS_STOP_LIST, CORPUS_MAX_DOCS, CORPUS_MAX_CHARS,
+                       CORPUS_MAX_FEATURES, CORPUS_SIM_CELLS, CORPUS_SIM_BLOCK)
+
+RE_TOKEN = re.compile(r"[^\W_]+(?:'[^\W_]+)*")
+RE_SENTENCE = re.compile(r"[.!?]+(?=[\s\"')\]]|$)")
+RE_VOWELS = re.compile(r"[aeiouy]+")
+_SPLITTERS = {
+    "Blank line": re.compile(r"\n[ \t]*\n\s*"),
+    "Each line": re.compile(r"\s*\n\s*"),
+    "--- separator": re.compile(r"^-{3,}[ \t]*$", re.MULTILINE),
+}
+
+def syllables(word: str) -> int:
+    """Vowel-group estimate with a silent final 'e' dropped; at least 1."""
+    n = len(RE_VOWELS.findall(word))
+    if n > 1 and word.endswith("e") and not word.endswith(("le", "ee", "ye")): n -= 1
+    return max(n, 1)
+
+def split(text: str, how: str) -> List[str]:
+    """Documents in `text`; "Each file" keeps the whole text as one."""
+    if how not in _SPLITTERS: return [text.strip()] if text.strip() else []
+    return [doc.strip() for doc in _SPLITTERS[how].split(text) if doc.strip()]
+
+def load(paths: Iterable[str], how: str, limit: int = CORPUS_MAX_CHARS) -> Iterator[str]:
+    """Documents from uploaded files; stops at `limit` characters in total."""
+    for path in paths:
+        with open(path, encoding="utf-8", errors="replace") as f: text = f.read(limit + 1)
+        limit -= len(text)
+        if limit < 0: raise ValueError(f"Upload too large (max {CORPUS_MAX_CHARS:,} characters per add)")
+        yield from split(text, how)
+
+class _Column:
+    """Append-only array; capacity doubles so appends are amortized O(new items)."""
+    __slots__ = ("data", "size")
+
+    def __init__(self, dtype) -> None:
+        self.data = np.zeros(64, dtype)
+        self.size = 0
+
+    def extend(self, values) -> None:
+        end = self.size + len(values)
+        if end > len(self.data):
+            grown = np.zeros(max(end, 2 * len(self.data)), self.data.dtype)
+            grown[:self.size] = self.data[:self.size]
+            self.data = grown
+        self.data[self.size:end] = values
+        self.size = end
+
+    def view(self) -> np.ndarray:
+        return self.data[:self.size]
+
+class Nearest(NamedTuple):
+    doc: np.ndarray     # Most similar other document, -1 when nothing is shared
+    score: np.ndarray   # Cosine similarity of TF-IDF vectors
+    exact: bool         # False when the feature cap dropped shared terms
+
+class Corpus:
+    """Documents indexed once; stop-word lists are masks applied at query time.
+
+    Rows hold every token (readability needs the full word count), so
+    switching stop lists never re-indexes. Derived arrays are cached until
+    the next `add`.
+    """
+
+    def __init__(self) -> None:
+        self.vocab: Dict[str, int] = {}
+        self.terms: List[str] = []
+        self.titles: List[str] = []
+        # CSR: row d is indices/counts[indptr[d]:indptr[d + 1]]
+        self.indptr = _Column(np.int64)
+        self.indptr.extend([0])
+        self.indices = _Column(np.int32)
+        self.counts = _Column(np.int32)
+        # Per document
+        self.words = _Column(np.int64)
+        self.sentences = _Column(np.int64)
+        self.syllables = _Column(np.int64)
+        # Per term
+        self.df = _Column(np.int64)
+        self.totals = _Column(np.int64)
+        self.term_syllables = _Column(np.int32)
+        self._masks: Dict[str, _Column] = {}
+        self._cache: Dict[tuple, object] = {}
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    @property
+    def tokens(self) -> int:
+        return int(self.words.view().sum())
+
+    def add(self, docs: Iterable[str]) -> int:
+        """Index `docs`; only the new rows and new terms are computed."""
+        vocab, old_terms = self.vocab, len(self.terms)
+        ids, freqs, sentences, titles = [], [], [], []
+        try:
+            for text in docs:
+                if len(self.titles) + len(titles) >= CORPUS_MAX_DOCS: raise ValueError(f"Corpus is full (max {CORPUS_MAX_DOCS:,} documents)")
+                counts = Counter(RE_TOKEN.findall(text.lower().replace("’", "'")))
+                # Insertion order is the term id, so self.terms stays list(vocab)
+                ids.append(np.fromiter((vocab.setdefault(t, len(vocab)) for t in counts), np.int32, len(counts)))
+                freqs.append(np.fromiter(counts.values(), np.int32, len(counts)))
+                sentences.append(max(len(RE_SENTENCE.findall(text)), 1) if counts else 0)
+                titles.append(" ".join(text.split()[:12])[:80])
+        except BaseException:
+            # All or nothing: forget terms first seen in this batch
+            for term in list(vocab)[old_terms:]: del vocab[term]
+            raise
+        if not titles: return 0
+
+        new_terms = list(vocab)[old_terms:]
+        self.terms.extend(new_terms)
+        self.term_syllables.extend(np.fromiter(map(syllables, new_terms), np.int32, len(new_terms)))
+        self.df.extend(np.zeros(len(new_terms), np.int64))
+        self.totals.extend(np.zeros(len(new_terms), np.int64))
+
+        lengths = np.fromiter(map(len, ids), np.int64, len(ids))
+        indices, counts = np.concatenate(ids), np.concatenate(freqs)
+        rows = np.repeat(np.arange(len(ids)), lengths)
+        self.indptr.extend(self.indptr.view()[-1] + np.cumsum(lengths))
+        self.indices.extend(indices)
+        self.counts.extend(counts)
+        self.words.extend(np.bincount(rows, weights=counts, minlength=len(ids)).astype(np.int64))
+        self.sentences.extend(sentences)
+        self.syllables.extend(np.bincount(rows, weights=counts * self.term_syllables.view()[indices], minlength=len(ids)).astype(np.int64))
+        size = len(self.terms)
+        self.df.view()[:] += np.bincount(indices, minlength=size)
+        self.totals.view()[:] += np.bincount(indices, weights=counts, minlength=size).astype(np.int64)
+        self.titles.extend(titles)
+        self._cache.clear()
+        return len(titles)
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 🧮 DERIVED ARRAYS
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def mask(self, stop: str = CORPUS_STOP_LIST) -> np.ndarray:
+        """True for terms excluded as keywords (stop words and single characters)."""
+        if stop not in STOP_WORD_LISTS: raise ValueError(f"Unknown stop-word list '{stop}'. Available: {', '.join(STOP_WORD_LISTS)}")
+        words = STOP_WORD_LISTS[stop]
+        column = self._masks.setdefault(stop, _Column(bool))
+        new = self.terms[column.size:]
+        if new: column.extend(np.fromiter((len(t) < 2 or t in words for t in new), bool, len(new)))
+        return column.view()
+
+    def _rows(self) -> np.ndarray:
+        if "rows" not in self._cache:
+            self._cache["rows"] = np.repeat(np.arange(len(self)), np.diff(self.indptr.view()))
+        return self._cache["rows"]
+
+    def idf(self) -> np.ndarray:
+        """Smoothed inverse document frequency: ln((1 + N) / (1 + df)) + 1."""
+        return np.log((1 + len(self)) / (1 + self.df.view())) + 1
+
+    def weights(self, stop: str = CORPUS_STOP_LIST) -> np.ndarray:
+        """TF-IDF weight of every stored entry (term frequency normalized by length)."""
+        key = ("weights", stop)
+        if key not in self._cache:
+            indices, rows = self.indices.view(), self._rows()
+            words = np.maximum(self.words.view(), 1)
+            w = self.counts.view() / words[rows] * self.idf()[indices]
+            w[self.mask(stop)[indices]] = 0
+            self._cache[key] = w
+        return self._cache[key]
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 📊 QUERIES
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def keywords(self, k: int, stop: str = CORPUS_STOP_LIST) -> List[List[Tuple[str, float]]]:
+        """Top-k TF-IDF terms of every document (one sort over all entries)."""
+        if not len(self): return []
+        w, rows = self.weights(stop), self._rows()
+        order = np.lexsort((self.indices.view(), -w, rows))  # Row, weight desc, term id
+        rank = np.arange(len(order)) - self.indptr.view()[rows[order]]
+        keep = order[(rank < k) & (w[order] > 0)]
+        bounds = np.searchsorted(rows[keep], np.arange(1, len(self)))
+        terms, indices = self.terms, self.indices.view()
+        return [[(terms[t], float(s)) for t, s in zip(indices[part], w[part])] for part in np.split(keep, bounds)]
+
+    def keywords_of(self, doc: int, k: int, stop: str = CORPUS_STOP_LIST) -> List[Tuple[str, float]]:
+        """Top-k TF-IDF terms of one document (sorts only its row)."""
+        start, end = self.indptr.view()[doc:doc + 2]
+        w, terms = self.weights(stop)[start:end], self.indices.view()[start:end]
+        order = np.lexsort((terms, -w))[:k]
+        return [(self.terms[terms[i]], float(w[i])) for i in order if w[i] > 0]
+
+    def frequencies(self, n: int, stop: str = CORPUS_STOP_LIST) -> List[Tuple[str, int, int]]:
+        """Top-n (term, occurrences, documents) across the corpus."""
+        totals = np.where(self.mask(stop), 0, self.totals.view())
+        n = min(n, int(np.count_nonzero(totals)))
+        if not n: return []
+        top = np.argpartition(-totals, n - 1)[:n]
+        top = top[np.lexsort((top, -totals[top]))]
+        df = self.df.view()
+        return [(self.terms[t], int(totals[t]), int(df[t])) for t in top]
+
+    def readability(self, doc: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(Flesch reading ease, Flesch-Kincaid grade) per document, or pooled for `doc=-1`."""
+        words, sentences, syl = (c.view().astype(float) for c in (self.words, self.sentences, self.syllables))
+        if doc == -1: words, sentences, syl = words.sum(keepdims=True), sentences.sum(keepdims=True), syl.sum(keepdims=True)
+        elif doc is not None: words, sentences, syl = words[doc:doc + 1], sentences[doc:doc + 1], syl[doc:doc + 1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            wps, spw = words / sentences, syl / words
+        return 206.835 - 1.015 * wps - 84.6 * spw, 0.39 * wps + 11.8 * spw - 15.59
+
+    def _norms(self, stop: str) -> np.ndarray:
+        w = self.weights(stop)
+        return np.sqrt(np.bincount(self._rows(), weights=w * w, minlength=len(self)))
+
+    def similar(self, doc: int, k: int, stop: str = CORPUS_STOP_LIST) -> List[Tuple[int, float]]:
+        """Exact top-k cosine neighbours of one document (one pass over the entries)."""
+        w, rows, indices = self.weights(stop), self._rows(), self.indices.view()
+        norms = self._norms(stop)
+        if not norms[doc]: return []
+        start, end = self.indptr.view()[doc:doc + 2]
+        query = np.zeros(len(self.terms))
+        query[indices[start:end]] = w[start:end] / norms[doc]
+        dots = np.bincount(rows, weights=w * query[indices], minlength=len(self))
+        scores = np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+        scores[doc] = 0
+        k = min(k, int(np.count_nonzero(scores > 0)))
+        if not k: return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.lexsort((top, -scores[top]))]
+        return [(int(d), float(scores[d])) for d in top]
+
+    def nearest(self, stop: str = CORPUS_STOP_LIST) -> Nearest:
+        """Most similar other document for every document.
+
+        Only terms in two or more documents can contribute to a dot product,
+        so just those become dense columns (norms still use every term); the
+        result is exact unless they exceed the feature cap.
+        """
+        key = ("nearest", stop)
+        if key in self._cache: return self._cache[key]
+        n = len(self)
+        w, rows, indices = self.weights(stop), self._rows(), self.indices.view()
+        norms = self._norms(stop)
+        df = np.where(self.mask(stop), 0, self.df.view())
+        shared = np.flatnonzero(df > 1)
+        cap = max(1, min(CORPUS_MAX_FEATURES, CORPUS_SIM_CELLS // max(n, 1)))
+        if len(shared) > cap: shared = shared[np.argpartition(-df[shared], cap - 1)[:cap]]
+        column = np.full(len(self.terms), -1, np.int64)
+        column[shared] = np.arange(len(shared))
+        cols = column[indices]
+        keep = (cols >= 0) & (w > 0)
+        dense = np.zeros((n, len(shared)), np.float32)
+        dense[rows[keep], cols[keep]] = w[keep] / norms[rows[keep]]
+
+        best, score = np.full(n, -1, np.int64), np.zeros(n, np.float32)
+        for start in range(0, n, CORPUS_SIM_BLOCK):
+            block = dense[start:start + CORPUS_SIM_BLOCK] @ dense.T
+            own = np.arange(len(block))
+            block[own, own + start] = -1  # Never its own neighbour
+            best[start:start + len(block)] = block.argmax(axis=1)
+            score[start:start + len(block)] = block[own, best[start:start + len(block)]]
+        best[score <= 0] = -1
+        score[score <= 0] = 0
+        result = Nearest(best, score, exact=int(np.count_nonzero(df > 1)) <= cap)
+        self._cache[key] = result
+        return result
+
+    def pairs(self, n: int, stop: str = CORPUS_STOP_LIST) -> List[Tuple[int, int, float]]:
+        """The n most similar document pairs (each pair listed once)."""
+        near = self.nearest(stop)
+        docs = np.flatnonzero(near.doc >= 0)
+        seen, out = set(), []
+        for d in docs[np.lexsort((docs, -near.score[docs]))]:
+            pair = (min(d, near.doc[d]), max(d, near.doc[d]))
+            if pair in seen: continue
+            seen.add(pair)
+            out.append((int(pair[0]), int(pair[1]), float(near.score[d])))
+            if len(out) == n: break
+        return out
+
+def build(docs: Sequence[str]) -> Corpus:
+    corpus = Corpus()
+    corpus.add(docs)
+    return corpus
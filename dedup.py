@@ -0,0 +1,100 @@
+"""
+Gardio Dedup Engine
+Duplicate-line removal that stores fixed-size digests, not the lines.
+"""
+import math
+from hashlib import blake2b
+from typing import Callable, Dict, Iterable, Iterator, TypeVar, Union
+
+from constants import DEDUP_DIGEST_SIZE, DEDUP_BLOOM_CAPACITY, DEDUP_FP_RATE
+
+Line = TypeVar("Line", str, bytes)
+
+class ExactFilter:
+    """Set of line digests: memory per distinct line is constant, not len(line)."""
+
+    def __init__(self) -> None:
+        self._seen: set = set()
+
+    def add(self, digest: bytes) -> bool:
+        """Record `digest`; True if it was not seen before."""
+        if digest in self._seen: return False
+        self._seen.add(digest)
+        return True
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+class BloomFilter:
+    """Fixed-size probabilistic filter; may drop a unique line at `fp_rate`."""
+
+    def __init__(self, capacity: int = DEDUP_BLOOM_CAPACITY, fp_rate: float = DEDUP_FP_RATE) -> None:
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(fp_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def add(self, digest: bytes) -> bool:
+        # Double hashing: k probe positions from two 64-bit halves of one digest
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:16], "little") | 1
+        bits, size, new = self.bits, self.size, False
+        for i in range(self.hashes):
+            pos = (h1 + i * h2) % size
+            mask = 1 << (pos & 7)
+            if not bits[pos >> 3] & mask:
+                bits[pos >> 3] |= mask
+                new = True
+        self.count += new
+        return new
+
+    def __len__(self) -> int:
+        return self.count
+
+def normalizer(ignore_case: bool = False, ignore_whitespace: bool = False) -> Callable[[Line], Line]:
+    """Key function applied before hashing (the original line is what is kept)."""
+    def key(line):
+        if ignore_whitespace: line = (b" " if isinstance(line, bytes) else " ").join(line.split())
+        if ignore_case: line = line.lower()
+        return line
+    return key
+
+def digest(line: Union[str, bytes]) -> bytes:
+    data = line.encode("utf-8", "surrogatepass") if isinstance(line, str) else line
+    return blake2b(data, digest_size=DEDUP_DIGEST_SIZE).digest()
+
+def options(labels: Iterable[str]) -> Dict[str, Union[str, bool]]:
+    """Map UI checkbox labels (DEDUP_OPTIONS) to dedup() keyword arguments."""
+    labels = set(labels or ())
+    return {"ignore_case": "Ignore case" in labels, "ignore_whitespace": "Ignore whitespace" in labels,
+            "keep": "last" if "Keep last" in labels else "first",
+            "mode": "approximate" if "Approximate (Bloom)" in labels else "exact"}
+
+def dedup(lines: Iterable[Line], mode: str = "exact", keep: str = "first",
+          ignore_case: bool = False, ignore_whitespace: bool = False,
+          capacity: int = DEDUP_BLOOM_CAPACITY, fp_rate: float = DEDUP_FP_RATE) -> Iterator[Line]:
+    """Stream `lines` with duplicates removed.
+
+    mode: "exact" (digest set) or "approximate" (Bloom filter, fixed memory).
+    keep: "first" or "last" occurrence; "last" makes two passes, so
+    `lines` must be re-iterable (a list, or an object with __iter__).
+    """
+    if mode not in ("exact", "approximate"): raise ValueError(f"Unknown mode '{mode}'")
+    if keep not in ("first", "last"): raise ValueError(f"Unknown keep '{keep}'")
+    plain = not (ignore_case or ignore_whitespace)
+    key = normalizer(ignore_case, ignore_whitespace)
+
+    if keep == "last":
+        if mode != "exact": raise ValueError("keep='last' requires exact mode")
+        if iter(lines) is lines: raise ValueError("keep='last' needs a re-iterable source")
+        last: Dict[bytes, int] = {}
+        for i, line in enumerate(lines): last[digest(line if plain else key(line))] = i
+        for i, line in enumerate(lines):
+            if last[digest(line if plain else key(line))] == i: yield line
+        return
+
+    seen = ExactFilter() if mode == "exact" else BloomFilter(capacity, fp_rate)
+    add = seen.add
+    for line in lines:
+        if add(digest(line if plain else key(line))): yield line
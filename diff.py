@@ -0,0 +1,223 @@
+"""
+Gardio Diff Engine
+Line-interned patience/Myers diff with a time budget and streamed hunks.
+"""
+import time
+import html
+from collections import Counter
+from bisect import bisect_left
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from constants import DIFF_CONTEXT, DIFF_MAX_EDITS, DIFF_TIME_BUDGET
+
+Block = Tuple[int, int, int]              # (a_start, b_start, size)
+Opcode = Tuple[str, int, int, int, int]   # difflib-compatible opcode
+
+class Budget:
+    """Time/edit limits for one diff; `degraded` is set once a limit is hit."""
+
+    def __init__(self, seconds: float = DIFF_TIME_BUDGET, max_edits: int = DIFF_MAX_EDITS) -> None:
+        self.deadline = time.monotonic() + seconds
+        self.max_edits = max_edits
+        self.degraded = False
+
+    def expired(self) -> bool:
+        return time.monotonic() > self.deadline
+
+def intern_lines(a: Sequence[str], b: Sequence[str]) -> Tuple[List[int], List[int]]:
+    """Map every distinct line to a small int so comparisons are O(1)."""
+    table: dict = {}
+    ids_a = [table.setdefault(line, len(table)) for line in a]
+    ids_b = [table.setdefault(line, len(table)) for line in b]
+    return ids_a, ids_b
+
+def _unique_anchors(a: List[int], b: List[int], a0: int, a1: int, b0: int, b1: int) -> List[Tuple[int, int]]:
+    """Patience step: longest increasing run of lines unique to both ranges."""
+    count_a, count_b = Counter(a[a0:a1]), Counter(b[b0:b1])
+    pos_b = {b[j]: j for j in range(b0, b1) if count_b[b[j]] == 1}
+    pairs = [(i, pos_b[a[i]]) for i in range(a0, a1) if count_a[a[i]] == 1 and a[i] in pos_b]
+    if not pairs: return []
+    # Patience sorting: tails[k] = smallest b-position ending an increasing run of length k+1
+    tails: List[int] = []
+    tail_idx: List[int] = []
+    back: List[int] = [-1] * len(pairs)
+    for idx, (_, j) in enumerate(pairs):
+        k = bisect_left(tails, j)
+        if k == len(tails):
+            tails.append(j)
+            tail_idx.append(idx)
+        else:
+            tails[k] = j
+            tail_idx[k] = idx
+        back[idx] = tail_idx[k - 1] if k else -1
+    run, idx = [], tail_idx[-1]
+    while idx >= 0:
+        run.append(pairs[idx])
+        idx = back[idx]
+    run.reverse()
+    return run
+
+def _myers(a: List[int], b: List[int], a0: int, a1: int, b0: int, b1: int,
+           budget: Budget) -> Optional[List[Block]]:
+    """Greedy O(ND) Myers diff; returns None when the edit budget runs out."""
+    n, m = a1 - a0, b1 - b0
+    max_d = min(n + m, budget.max_edits)
+    offset = max_d + 1
+    v = [0] * (2 * max_d + 3)
+    trace: List[List[int]] = []
+    for d in range(max_d + 1):
+        if d & 63 == 0 and budget.expired(): return None
+        trace.append(v[offset - d - 1:offset + d + 2])
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]): x = v[offset + k + 1]
+            else: x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[a0 + x] == b[b0 + y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m: return _backtrack(trace, n, m, a0, b0)
+    return None
+
+def _backtrack(trace: List[List[int]], x: int, y: int, a0: int, b0: int) -> List[Block]:
+    blocks: List[Block] = []
+    for d in range(len(trace) - 1, 0, -1):
+        snap = trace[d]          # v before step d, indexed from k = -d - 1
+        k = x - y
+        if k == -d or (k != d and snap[k - 1 + d + 1] < snap[k + 1 + d + 1]):
+            prev_k = k + 1
+            prev_x = snap[prev_k + d + 1]
+            mid_x = prev_x
+        else:
+            prev_k = k - 1
+            prev_x = snap[prev_k + d + 1]
+            mid_x = prev_x + 1
+        if x > mid_x: blocks.append((a0 + mid_x, b0 + mid_x - k, x - mid_x))
+        x, y = prev_x, prev_x - prev_k
+    if x: blocks.append((a0, b0, x))
+    blocks.reverse()
+    return blocks
+
+def matching_blocks(a: List[int], b: List[int], budget: Budget) -> Iterator[Block]:
+    """Yield matching blocks left to right so hunks can be streamed early."""
+    stack: list = [(0, len(a), 0, len(b))]
+    while stack:
+        item = stack.pop()
+        if len(item) == 3:
+            yield item
+            continue
+        a0, a1, b0, b1 = item
+        p = 0
+        while a0 + p < a1 and b0 + p < b1 and a[a0 + p] == b[b0 + p]: p += 1
+        if p: yield (a0, b0, p)
+        a0, b0 = a0 + p, b0 + p
+        s = 0
+        while a1 - s > a0 and b1 - s > b0 and a[a1 - s - 1] == b[b1 - s - 1]: s += 1
+        a1, b1 = a1 - s, b1 - s
+        work: list = []
+        if a0 < a1 and b0 < b1:
+            anchors = _unique_anchors(a, b, a0, a1, b0, b1)
+            if anchors:
+                pa, pb = a0, b0
+                for i, j in anchors:
+                    work += [(pa, i, pb, j), (i, j, 1)]
+                    pa, pb = i + 1, j + 1
+                work.append((pa, a1, pb, b1))
+            elif not set(a[a0:a1]).isdisjoint(b[b0:b1]):
+                blocks = None if budget.degraded else _myers(a, b, a0, a1, b0, b1, budget)
+                # Over budget: fall back to replacing the whole range
+                if blocks is None: budget.degraded = True
+                else: work += blocks
+        if s: work.append((a1, b1, s))
+        stack.extend(reversed(work))
+
+def opcodes(blocks: Iterator[Block], n: int, m: int) -> Iterator[Opcode]:
+    i = j = 0
+    pending: Optional[List[int]] = None
+    for ai, bj, size in blocks:
+        if pending and pending[0] + pending[2] == ai and pending[1] + pending[2] == bj:
+            pending[2] += size
+            continue
+        if pending:
+            yield from _emit(i, j, *pending)
+            i, j = pending[0] + pending[2], pending[1] + pending[2]
+        pending = [ai, bj, size]
+    if pending:
+        yield from _emit(i, j, *pending)
+        i, j = pending[0] + pending[2], pending[1] + pending[2]
+    yield from _emit(i, j, n, m, 0)
+
+def _emit(i: int, j: int, ai: int, bj: int, size: int) -> Iterator[Opcode]:
+    if i < ai and j < bj: yield ("replace", i, ai, j, bj)
+    elif i < ai: yield ("delete", i, ai, j, bj)
+    elif j < bj: yield ("insert", i, ai, j, bj)
+    if size: yield ("equal", ai, ai + size, bj, bj + size)
+
+def grouped(codes: Iterator[Opcode], n: int = DIFF_CONTEXT) -> Iterator[List[Opcode]]:
+    """Streaming equivalent of difflib.SequenceMatcher.get_grouped_opcodes."""
+    nn, group, first = n + n, [], True
+    codes = iter(codes)
+    current = next(codes, None)
+    while current is not None:
+        following = next(codes, None)
+        tag, i1, i2, j1, j2 = current
+        if tag == "equal":
+            if first: i1, j1 = max(i1, i2 - n), max(j1, j2 - n)
+            if following is None: i2, j2 = min(i2, i1 + n), min(j2, j1 + n)
+            if i2 - i1 > nn:
+                group.append((tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)))
+                yield group
+                group = []
+                i1, j1 = max(i1, i2 - n), max(j1, j2 - n)
+        group.append((tag, i1, i2, j1, j2))
+        first, current = False, following
+    if group and not (len(group) == 1 and group[0][0] == "equal"): yield group
+
+def _range(start: int, stop: int) -> str:
+    length = stop - start
+    if length == 1: return str(start + 1)
+    return f"{start if not length else start + 1},{length}"
+
+def hunks(a: Sequence[str], b: Sequence[str], budget: Optional[Budget] = None,
+          context: int = DIFF_CONTEXT) -> Iterator[List[Opcode]]:
+    ids_a, ids_b = intern_lines(a, b)
+    budget = budget or Budget()
+    return grouped(opcodes(matching_blocks(ids_a, ids_b, budget), len(a), len(b)), context)
+
+def unified(a: Sequence[str], b: Sequence[str], groups: Iterator[List[Opcode]],
+            fromfile: str = "Text A", tofile: str = "Text B") -> Iterator[str]:
+    """Render hunks in the same format as difflib.unified_diff(lineterm="")."""
+    started = False
+    for group in groups:
+        if not started:
+            started = True
+            yield f"--- {fromfile}"
+            yield f"+++ {tofile}"
+        yield from unified_hunk(a, b, group)
+
+def unified_hunk(a: Sequence[str], b: Sequence[str], group: List[Opcode]) -> Iterator[str]:
+    yield f"@@ -{_range(group[0][1], group[-1][2])} +{_range(group[0][3], group[-1][4])} @@"
+    for tag, i1, i2, j1, j2 in group:
+        if tag == "equal":
+            for line in a[i1:i2]: yield " " + line
+            continue
+        for line in a[i1:i2]: yield "-" + line
+        for line in b[j1:j2]: yield "+" + line
+
+def _cell(num: Optional[int], line: Optional[str], cls: str) -> str:
+    if line is None: return '<td class="diff-num"></td><td class="diff-empty"></td>'
+    return f'<td class="diff-num">{num}</td><td class="{cls}">{html.escape(line)}</td>'
+
+def side_by_side(a: Sequence[str], b: Sequence[str], group: List[Opcode]) -> str:
+    """Render one hunk as side-by-side table rows."""
+    rows = [f'<tr class="diff-hunk"><td colspan="4">@@ -{_range(group[0][1], group[-1][2])} +{_range(group[0][3], group[-1][4])} @@</td></tr>']
+    for tag, i1, i2, j1, j2 in group:
+        if tag == "equal":
+            for k in range(i2 - i1):
+                rows.append(f"<tr>{_cell(i1 + k + 1, a[i1 + k], 'diff-eq')}{_cell(j1 + k + 1, b[j1 + k], 'diff-eq')}</tr>")
+            continue
+        for k in range(max(i2 - i1, j2 - j1)):
+            left = _cell(i1 + k + 1, a[i1 + k], "diff-del") if i1 + k < i2 else _cell(None, None, "")
+            right = _cell(j1 + k + 1, b[j1 + k], "diff-add") if j1 + k < j2 else _cell(None, None, "")
+            rows.append(f"<tr>{left}{right}</tr>")
+    return "".join(rows)
@@ -0,0 +1,191 @@
+"""
+Gardio Execution Backend
+Runs CPU-bound tools in a pre-warmed process pool with per-tool limits.
+"""
+import os
+import asyncio
+import inspect
+import functools
+import threading
+import importlib
+import multiprocessing
+from queue import Empty
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from cache import make_key
+from constants import (EXECUTOR_WORKERS, EXECUTOR_INLINE_CHARS, EXECUTOR_TOOL_LIMITS,
+                       EXECUTOR_QUEUE_LIMIT)
+
+_MISSING = object()
+_pool: Optional[ProcessPoolExecutor] = None
+_manager: Any = None
+_pool_lock = threading.Lock()
+_limiters: Dict[str, "Limiter"] = {}
+_POLL = 0.5  # Seconds between checks that a streaming job is still alive
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 🧵 WORKERS
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def _resolve(module: str, name: str) -> Callable:
+    fn = getattr(importlib.import_module(module), name)
+    # Skip the memoize wrapper: the parent process owns the shared cache
+    return getattr(fn, "__wrapped__", fn)
+
+def _call(module: str, name: str, args: tuple) -> Any:
+    return _resolve(module, name)(*args)
+
+def _stream(module: str, name: str, args: tuple, queue: Any, cancel: Any) -> None:
+    """Run a streaming tool, forwarding each update through a manager queue."""
+    try:
+        for update in _resolve(module, name)(*args):
+            if cancel.is_set(): break
+            queue.put((False, update))
+    finally: queue.put((True, None))
+
+def _warm() -> int:
+    import startup
+    logic = importlib.import_module("logic")
+    startup.preload(*logic.ENGINES)  # Pay deferred imports before the first job
+    return os.getpid()
+
+def start() -> Optional[ProcessPoolExecutor]:
+    """Create the pool and fork every worker up front (call before launch)."""
+    global _pool, _manager
+    if EXECUTOR_WORKERS <= 0: return None
+    with _pool_lock:
+        if _pool is None:
+            ctx = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else multiprocessing.get_context()
+            _manager = ctx.Manager()  # Carries streamed updates back from workers
+            _pool = ProcessPoolExecutor(max_workers=EXECUTOR_WORKERS, mp_context=ctx, initializer=_warm)
+            # Any job forces the fork; the initializer has warmed the worker by the time it returns
+            for f in [_pool.submit(os.getpid) for _ in range(EXECUTOR_WORKERS)]: f.result()
+    return _pool
+
+def shutdown() -> None:
+    global _pool, _manager
+    with _pool_lock:
+        if _pool is not None: _pool.shutdown(wait=False, cancel_futures=True)
+        if _manager is not None: _manager.shutdown()
+        _pool = _manager = None
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 🚦 LIMITS
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+class Limiter:
+    """Per-tool concurrency cap with a bounded wait queue."""
+
+    def __init__(self, limit: int, queue_limit: int = EXECUTOR_QUEUE_LIMIT) -> None:
+        self.limit = limit
+        self.queue_limit = queue_limit
+        self.running = 0
+        self.waiting = 0
+        self._sem: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "Limiter":
+        if self._sem is None: self._sem = asyncio.Semaphore(self.limit)
+        if self._sem.locked() and self.waiting >= self.queue_limit: _busy()
+        self.waiting += 1
+        try: await self._sem.acquire()
+        finally: self.waiting -= 1
+        self.running += 1
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.running -= 1
+        self._sem.release()
+
+def limiter(tool: str) -> Limiter:
+    if tool not in _limiters: _limiters[tool] = Limiter(EXECUTOR_TOOL_LIMITS.get(tool, max(EXECUTOR_WORKERS, 1)))
+    return _limiters[tool]
+
+def _busy() -> None:
+    import gradio as gr  # Deferred: workers never need the UI stack
+    raise gr.Error("Server is busy, please try again in a moment.")
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 🚀 OFFLOAD
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def _input_size(args: tuple) -> int:
+    return sum(len(a) for a in args if isinstance(a, str))
+
+async def _submit(tool: str, runner: Callable, fn: Callable, args: tuple) -> Any:
+    async with limiter(tool):
+        future = start().submit(runner, fn.__module__, fn.__name__, args)
+        try: return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # Client went away: drop the job if a worker has not picked it up yet
+            future.cancel()
+            raise
+
+def _next(queue: Any, future: Any) -> tuple:
+    """Next (done, update) from a streaming job; also ends if the job never ran."""
+    while True:
+        try: return queue.get(timeout=_POLL)
+        except Empty:
+            # Cancelled before a worker picked it up (or the worker died): no sentinel is coming
+            if future.done(): return True, None
+
+async def _submit_stream(tool: str, fn: Callable, args: tuple) -> AsyncIterator[Any]:
+    async with limiter(tool):
+        pool = start()
+        queue, cancel = _manager.Queue(), _manager.Event()
+        future = pool.submit(_stream, fn.__module__, fn.__name__, args, queue, cancel)
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                done, update = await loop.run_in_executor(None, _next, queue, future)
+                if done: break
+                yield update
+            await asyncio.wrap_future(future)  # Re-raise worker errors
+        except (asyncio.CancelledError, GeneratorExit):
+            # Client went away: stop the worker at its next update
+            cancel.set()
+            future.cancel()
+            raise
+
+def offload(tool: str, fn: Callable, inline_below: int = EXECUTOR_INLINE_CHARS) -> Callable:
+    """Wrap a module-level logic function as an async Gradio handler.
+
+    Inputs under `inline_below` chars run on a thread (IPC would dominate),
+    never on the event loop; larger ones go to the process pool, with
+    generator tools streaming their updates back. Memoized tools are looked up and stored in the parent's
+    result cache so repeat calls never leave the web worker.
+    """
+    if EXECUTOR_WORKERS <= 0: return fn  # Plain sync handler: Gradio runs it in its threadpool
+    store = getattr(fn, "cache", None)
+
+    if inspect.isgeneratorfunction(getattr(fn, "__wrapped__", fn)):
+        @functools.wraps(fn)
+        async def stream_handler(*args):
+            if _input_size(args) < inline_below:
+                loop, updates = asyncio.get_running_loop(), iter(fn(*args))
+                while True:
+                    update = await loop.run_in_executor(None, next, updates, _MISSING)
+                    if update is _MISSING: return
+                    yield update
+            key = make_key(fn.tool, args, {}) if store is not None else None
+            if key is not None:
+                result = store.get(key, _MISSING)
+                if result is not _MISSING:
+                    yield result
+                    return
+            update = _MISSING
+            async for update in _submit_stream(tool, fn, args): yield update
+            if key is not None and update is not _MISSING: store.put(key, update)  # Final update only
+        return stream_handler
+
+    @functools.wraps(fn)
+    async def handler(*args):
+        if _input_size(args) < inline_below: return await asyncio.get_running_loop().run_in_executor(None, functools.partial(fn, *args))
+        key = make_key(fn.tool, args, {}) if store is not None else None
+        if key is not None:
+            result = store.get(key, _MISSING)
+            if result is not _MISSING: return result
+        result = await _submit(tool, _call, fn, args)
+        if key is not None: store.put(key, result)
+        return result
+    return handler
@@ -0,0 +1,125 @@
+"""
+Gardio Extraction Engine
+Named patterns scanned in priority order; each pattern keeps its own compiled
+search (literal prefixes, \b anchors), and their matches are merged lazily.
+"""
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    # `regex` can release the GIL while scanning and enforce timeouts
+    import regex as _re
+    _SCAN_OPTS = {"concurrent": True}
+except ImportError:
+    import re as _re
+    _SCAN_OPTS = {}
+
+from constants import (RE_NUMBERS, RE_URLS, RE_EMAILS, RE_IPV4, RE_DATES, RE_HASHTAGS,
+                       EXTRACT_KINDS, EXTRACT_TIMEOUT)
+
+class Match(NamedTuple):
+    kind: str
+    value: str
+    start: int
+    end: int
+
+# kind -> pattern source, in priority order
+PATTERNS: Dict[str, str] = {
+    "url": RE_URLS.pattern, "email": RE_EMAILS.pattern, "ipv4": RE_IPV4.pattern,
+    "date": RE_DATES.pattern, "hashtag": RE_HASHTAGS.pattern, "number": RE_NUMBERS.pattern,
+}
+PATTERNS = {kind: PATTERNS[kind] for kind in EXTRACT_KINDS}
+# Literals a match must contain (any one of them); a text without them skips that pass
+_NEEDS: Dict[str, Tuple[str, ...]] = {
+    "url": ("://",), "email": ("@",), "ipv4": (".",), "date": ("-", "/"), "hashtag": ("#",),
+}
+_custom: set = set()
+_compiled: Dict[str, object] = {}
+
+def register(kind: str, pattern: str, before: Optional[str] = None) -> None:
+    """Add a user pattern; it takes priority over `before` (default: lowest).
+
+    Use non-capturing groups (?:...) inside custom patterns.
+    """
+    if not kind.isidentifier(): raise ValueError(f"Invalid pattern name '{kind}'")
+    _re.compile(pattern)  # Fail fast on a bad pattern
+    items = [(k, v) for k, v in PATTERNS.items() if k != kind]
+    at = next((i for i, (k, _) in enumerate(items) if k == before), len(items))
+    items.insert(at, (kind, pattern))
+    PATTERNS.clear()
+    PATTERNS.update(items)
+    _custom.add(kind)
+    _NEEDS.pop(kind, None)  # A re-registered built-in name loses its hint
+    _compiled.clear()
+
+def scanner(kinds: Optional[Sequence[str]] = None) -> List[Tuple[str, object]]:
+    """(kind, compiled pattern) for the requested kinds, in priority order.
+
+    Patterns are compiled separately: one alternation over all of them
+    defeats each pattern's own prefix optimizations and measured slower
+    than separate passes (see the extract_* cases in benchmark.py).
+    """
+    unknown = set(kinds or ()) - set(PATTERNS)
+    if unknown: raise ValueError(f"Unknown pattern(s): {', '.join(sorted(unknown))}")
+    wanted = [k for k in PATTERNS if kinds is None or k in kinds]
+    for k in wanted:
+        if k not in _compiled: _compiled[k] = _re.compile(PATTERNS[k])
+    return [(k, _compiled[k]) for k in wanted]
+
+def scan(text: str, kinds: Optional[Sequence[str]] = None, offset: int = 0) -> Iterator[Match]:
+    """Yield typed, non-overlapping matches left to right.
+
+    When several kinds are requested a span is claimed once, by the
+    highest-priority kind matching at its start (a URL's digits are not
+    also reported as numbers), exactly as one alternation would. A single
+    kind behaves exactly like findall.
+    """
+    patterns = [(k, p) for k, p in scanner(kinds) if k not in _NEEDS or any(n in text for n in _NEEDS[k])]
+    if not patterns: return
+    opts = dict(_SCAN_OPTS)
+    if _re.__name__ == "regex" and _custom.intersection(k for k, _ in patterns): opts["timeout"] = EXTRACT_TIMEOUT
+    if len(patterns) == 1:
+        kind, pattern = patterns[0]
+        for m in pattern.finditer(text, **opts): yield Match(kind, m.group(), offset + m.start(), offset + m.end())
+        return
+    # One lazy finditer per kind; a head overlapping a claimed span is re-searched from its end
+    iters = [pattern.finditer(text, **opts) for _, pattern in patterns]
+    heads = [next(it, None) for it in iters]
+    pos = 0
+    while True:
+        best = None
+        for i, m in enumerate(heads):
+            if m is None: continue
+            if m.start() < pos:
+                iters[i] = patterns[i][1].finditer(text, pos, **opts)
+                m = heads[i] = next(iters[i], None)
+                if m is None: continue
+            # Strict < keeps the earlier (higher-priority) kind on ties
+            if best is None or m.start() < heads[best].start(): best = i
+        if best is None: return
+        # Emit the winner's run up to the next other head without re-checking every kind
+        nxt = min((h.start() for i, h in enumerate(heads) if h is not None and i != best), default=len(text) + 1)
+        kind, it, m = patterns[best][0], iters[best], heads[best]
+        while True:
+            yield Match(kind, m.group(), offset + m.start(), offset + m.end())
+            pos = m.end()
+            m = next(it, None)
+            if m is None or m.start() >= nxt: break
+        heads[best] = m
+
+def scan_lines(lines: Iterable[str], kinds: Optional[Sequence[str]] = None) -> Iterator[Match]:
+    """Stream matches over lines (ends kept) with offsets into the whole text."""
+    offset = 0
+    for line in lines:
+        yield from scan(line, kinds, offset)
+        offset += len(line)
+
+def findall(text: str, kind: str) -> List[str]:
+    (_, pattern), = scanner([kind])
+    if kind in _NEEDS and not any(n in text for n in _NEEDS[kind]): return []
+    # Built-in patterns have no capturing groups, so findall returns whole matches
+    return pattern.findall(text) if not pattern.groups else [m.group() for m in pattern.finditer(text)]
+
+def group(matches: Iterable[Match]) -> Dict[str, List[str]]:
+    found: Dict[str, List[str]] = {}
+    for m in matches: found.setdefault(m.kind, []).append(m.value)
+    return found
@@ -0,0 +1,145 @@
+"""
+Gardio File Mode
+Memory-mapped, line-streaming versions of the toolbox for large uploads.
+"""
+import os
+import mmap
+import time
+import codecs
+import tempfile
+from contextlib import contextmanager
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple, Union
+
+import stats
+import dedup
+import extract
+from stats import TextStats
+from constants import FILE_CHUNK_SIZE, FILE_AVG_LINE_BYTES, FILE_OUTPUT_DIR, FILE_OUTPUT_TTL
+
+@contextmanager
+def mapped(path: str) -> Iterator[Union[mmap.mmap, bytes]]:
+    """Read-only memory map of `path`; empty files (unmappable) give b""."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm: yield mm
+
+def byte_lines(mm: Union[mmap.mmap, bytes]) -> Iterator[bytes]:
+    """Yield lines without their b"\\n" / b"\\r\\n" terminator."""
+    if not len(mm): return
+    readline = mm.readline
+    while True:
+        line = readline()
+        if not line: return
+        if line.endswith(b"\n"): line = line[:-2] if line.endswith(b"\r\n") else line[:-1]
+        yield line
+
+def text_lines(mm) -> Iterator[str]:
+    for line in byte_lines(mm): yield line.decode("utf-8", "replace")
+
+def text_chunks(mm: Union[mmap.mmap, bytes]) -> Iterator[str]:
+    """Decoded fixed-size chunks, line terminators kept exactly as in the file."""
+    decoder = codecs.getincrementaldecoder("utf-8")("replace")
+    for start in range(0, len(mm), FILE_CHUNK_SIZE): yield decoder.decode(mm[start:start + FILE_CHUNK_SIZE])
+    yield decoder.decode(b"", final=True)
+
+def sweep(ttl: float = FILE_OUTPUT_TTL) -> int:
+    """Delete results older than `ttl`; Gradio serves downloads from its own cached copy."""
+    removed, cutoff = 0, time.time() - ttl
+    try: entries = list(os.scandir(FILE_OUTPUT_DIR))
+    except FileNotFoundError: return 0
+    for entry in entries:
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.unlink(entry.path)
+                removed += 1
+        except OSError: pass  # Already removed by another worker
+    return removed
+
+def output_file(tool: str) -> Tuple[str, BinaryIO]:
+    os.makedirs(FILE_OUTPUT_DIR, exist_ok=True)
+    sweep()
+    fd, path = tempfile.mkstemp(prefix=f"gardio_{tool}_", suffix=".txt", dir=FILE_OUTPUT_DIR)
+    return path, os.fdopen(fd, "wb", buffering=FILE_CHUNK_SIZE)
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 🧰 TOOLS
+# Each returns (summary counts, output path).
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def analyze(path: str, keywords: bool = False) -> TextStats:
+    with mapped(path) as mm:
+        # Same counts as textbox mode: a final line without a newline adds none
+        return stats.scan_chunks(text_chunks(mm), keywords)
+
+class _MappedLines:
+    """Re-iterable view of a mapping's lines (dedup keep='last' reads twice)."""
+
+    def __init__(self, mm: Union[mmap.mmap, bytes]) -> None:
+        self.mm = mm
+        self.count = 0
+
+    def __iter__(self) -> Iterator[bytes]:
+        if len(self.mm): self.mm.seek(0)
+        self.count = 0
+        for line in byte_lines(self.mm):
+            self.count += 1
+            yield line
+
+def remove_duplicates(path: str, **options) -> Tuple[Dict[str, int], str]:
+    """Stream unique lines to a file; see dedup.dedup() for options."""
+    out_path, out = output_file("unique")
+    kept = 0
+    with mapped(path) as mm, out:
+        if options.get("mode") == "approximate":
+            # Size the filter for this file rather than the global default
+            options.setdefault("capacity", max(len(mm) // FILE_AVG_LINE_BYTES, 1024))
+        lines = _MappedLines(mm)
+        for line in dedup.dedup(lines, **options):
+            if kept: out.write(b"\n")
+            out.write(line)
+            kept += 1
+    return {"Lines": lines.count, "Unique": kept, "Removed": lines.count - kept}, out_path
+
+def extract_matches(path: str, kinds: Optional[list] = None) -> Tuple[Dict[str, int], str]:
+    """One match per output line; prefixed with its kind when several are requested."""
+    out_path, out = output_file("matches")
+    tagged = kinds is None or len(kinds) != 1
+    counts: Dict[str, int] = {}
+    with mapped(path) as mm, out:
+        for m in extract.scan_lines((line + "\n" for line in text_lines(mm)), kinds):
+            counts[m.kind] = counts.get(m.kind, 0) + 1
+            out.write(f"{m.kind}\t{m.value}\n".encode() if tagged else f"{m.value}\n".encode())
+    return counts, out_path
+
+def find_replace(path: str, find: str, replace: str) -> Tuple[Dict[str, int], str]:
+    """Byte-level replace over fixed-size chunks; matches may span chunks."""
+    out_path, out = output_file("replaced")
+    needle, repl = find.encode(), replace.encode()
+    keep = len(needle) - 1
+    carry, hits = b"", 0
+    with mapped(path) as mm, out:
+        for start in range(0, len(mm), FILE_CHUNK_SIZE):
+            parts = (carry + mm[start:start + FILE_CHUNK_SIZE]).split(needle)
+            hits += len(parts) - 1
+            # The tail of the last part may hold the start of a match cut by the chunk end
+            tail = parts[-1]
+            cut = len(tail) - keep if keep else len(tail)
+            parts[-1], carry = tail[:max(cut, 0)], tail[max(cut, 0):]
+            out.write(repl.join(parts))
+        out.write(carry)
+    return {"Replacements": hits}, out_path
+
+def text_to_list(path: str) -> Tuple[Dict[str, int], str]:
+    out_path, out = output_file("list")
+    items = 0
+    with mapped(path) as mm, out:
+        out.write(b"[")
+        for line in text_lines(mm):
+            item = line.strip()
+            if not item: continue
+            out.write((", " if items else "").encode() + repr(item).encode("utf-8", "backslashreplace"))
+            items += 1
+        out.write(b"]")
+    return {"Items": items}, out_path
@@ -0,0 +1,143 @@
+"""
+Gardio Incremental Analysis
+Per-session state that re-tokenizes only the lines touched by an edit.
+"""
+import re
+from collections import Counter
+from itertools import compress
+from typing import List, Tuple
+
+from stats import TextStats, tokenize_line
+
+# Line breaks str.splitlines() honours besides '\n'; text containing them takes the slow path
+RE_OTHER_BREAKS = re.compile("[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+
+def edit_region(old: List[str], new: List[str]) -> Tuple[int, int, int]:
+    """Return (start, old_end, new_end) bounding the lines that differ."""
+    limit = min(len(old), len(new))
+    start = 0
+    while start < limit and old[start] == new[start]: start += 1
+    old_end, new_end = len(old), len(new)
+    while old_end > start and new_end > start and old[old_end - 1] == new[new_end - 1]:
+        old_end -= 1
+        new_end -= 1
+    return start, old_end, new_end
+
+def common_prefix(a: str, b: str, limit: int) -> int:
+    """Length of the common prefix, at most `limit`; halving slice compares run at C speed."""
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[lo:mid] == b[lo:mid]: lo = mid
+        else: hi = mid - 1
+    return lo
+
+def common_suffix(a: str, b: str, limit: int) -> int:
+    """Length of the common suffix, at most `limit`."""
+    lo, hi, la, lb = 0, limit, len(a), len(b)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[la - mid:la - lo] == b[lb - mid:lb - lo]: lo = mid
+        else: hi = mid - 1
+    return lo
+
+class LiveLines:
+    """Base state: keeps the previous text split into lines."""
+
+    def __init__(self) -> None:
+        self.text = ""
+        self.lines: List[str] = []
+        self.plain = True   # Only '\n' breaks, so line boundaries can be found with str.count/find
+
+    def update(self, text: str) -> "LiveLines":
+        old = self.text
+        if text == old: return self
+        limit = min(len(old), len(text))
+        prefix = common_prefix(old, text, limit)
+        suffix = common_suffix(old, text, limit - prefix)
+        if self.plain and not RE_OTHER_BREAKS.search(text, prefix, len(text) - suffix):
+            # Widen the changed span to whole lines: back to the line start, on past the next '\n'
+            begin = old.rfind("\n", 0, prefix) + 1
+            end = old.find("\n", len(old) - suffix) + 1 or len(old)
+            start = old.count("\n", 0, begin)
+            removed = self.lines[start:start + len(old[begin:end].splitlines())]
+            added = text[begin:end + len(text) - len(old)].splitlines()
+        else:
+            new = text.splitlines()
+            start, old_end, new_end = edit_region(self.lines, new)
+            removed, added = self.lines[start:old_end], new[start:new_end]
+            self.plain = not RE_OTHER_BREAKS.search(text)
+        self.lines[start:start + len(removed)] = added
+        self.text = text
+        self.on_splice(start, removed, added)
+        return self
+
+    def on_splice(self, start: int, removed: List[str], added: List[str]) -> None:
+        """Hook: lines[start:start + len(removed)] were replaced by `added`."""
+
+class LiveStats(LiveLines):
+    """Incremental counterpart of stats.scan()."""
+
+    def __init__(self, keywords: bool = True) -> None:
+        super().__init__()
+        self.keywords = keywords   # Analytics shows no frequencies, so skips counting them
+        self.tokens: List[Tuple[int, int, Counter]] = []
+        self.result = TextStats()
+
+    def on_splice(self, start: int, removed: List[str], added: List[str]) -> None:
+        result = self.result
+        old = self.tokens[start:start + len(removed)]
+        new = [tokenize_line(line, self.keywords) for line in added]
+        self.tokens[start:start + len(removed)] = new
+        for words, letters, freq in old: result.apply(words, letters, freq, -1)
+        for words, letters, freq in new: result.apply(words, letters, freq)
+        # Drop keywords whose count fell to zero so the table stays compact
+        for _, _, freq in old:
+            for word in freq:
+                if result.freq.get(word, 1) <= 0: del result.freq[word]
+        result.chars = len(self.text)
+        result.lines = len(self.lines)
+
+class LiveDedup(LiveLines):
+    """Incremental counterpart of logic.remove_duplicates()."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.counts: Counter = Counter()
+        self.keep: List[bool] = []   # Parallel to lines: True at each line's first occurrence
+
+    def on_splice(self, start: int, removed: List[str], added: List[str]) -> None:
+        lines, keep, counts = self.lines, self.keep, self.counts
+        keep[start:start + len(removed)] = [False] * len(added)
+        counts.subtract(removed)
+        counts.update(added)
+        # Only lines whose text was removed or added can change their first occurrence
+        after = start + len(added)
+        for line in set(removed).union(added):
+            if counts[line] <= 0:
+                del counts[line]
+                continue
+            first = lines.index(line)
+            keep[first] = True
+            # A first occurrence past the edit is superseded by one typed inside it
+            if start <= first < after:
+                try: keep[lines.index(line, after)] = False
+                except ValueError: pass
+
+    def output(self) -> str:
+        return "\n".join(compress(self.lines, self.keep))
+
+class LiveMatches(LiveLines):
+    """Incremental regex extraction; the pattern must not match across lines."""
+
+    def __init__(self, pattern: re.Pattern) -> None:
+        super().__init__()
+        self.pattern = pattern
+        self.matches: List[List[str]] = []
+
+    def on_splice(self, start: int, removed: List[str], added: List[str]) -> None:
+        findall = self.pattern.findall
+        self.matches[start:start + len(removed)] = [findall(line) for line in added]
+
+    def output(self, sep: str) -> str:
+        return sep.join(m for line in self.matches for m in line)
@@ -0,0 +1,192 @@
+"""
+Gardio Streaming JSON
+Token-level re-indenting/minifying without building the object graph.
+"""
+import re
+import json
+from typing import Iterable, Iterator, List, Optional
+
+from constants import JSON_FLUSH_PIECES, JSON_STDLIB_CHARS
+
+TOKEN = re.compile(r'''[ \t\n\r]*(?:
+     (?P<str>"(?:[^"\\\x00-\x1f]|\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4}))*")
+    |(?P<num>-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?)
+    |(?P<lit>true|false|null)
+    |(?P<punct>[{}\[\]:,])
+)''', re.X)
+RE_LOOSE_STRING = re.compile(r'"(?:[^"\\]|\\.)*"', re.S)
+RE_STRING_PART = re.compile(r'[^"\\\x00-\x1f]+|\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4})')  # Valid runs and escapes
+RE_SPACE = re.compile(r'[ \t\n\r]*')
+RE_LONE_SURROGATE = re.compile(r'\\u[dD][89a-fA-F]')  # May decode to a lone surrogate, which dumps cannot re-escape
+
+# Parser states
+VALUE, VALUE_OR_CLOSE, KEY, KEY_OR_CLOSE, COLON, COMMA_OR_CLOSE, END = range(7)
+EXPECTING = {
+    VALUE: "Expecting value", VALUE_OR_CLOSE: "Expecting value",
+    KEY: "Expecting property name enclosed in double quotes",
+    KEY_OR_CLOSE: "Expecting property name enclosed in double quotes",
+    COLON: "Expecting ':' delimiter", COMMA_OR_CLOSE: "Expecting ',' delimiter",
+    END: "Extra data",
+}
+MODES = {"Pretty": (2, False), "Minify": (None, False), "Sort Keys": (2, True)}
+
+class JSONStreamError(ValueError):
+    """Mirrors json.JSONDecodeError's message and position attributes."""
+
+    def __init__(self, msg: str, pos: int, lineno: int, colno: int) -> None:
+        super().__init__(f"{msg}: line {lineno} column {colno} (char {pos})")
+        self.msg, self.pos, self.lineno, self.colno = msg, pos, lineno, colno
+
+class _Frame:
+    __slots__ = ("close", "fresh", "members", "key")
+
+    def __init__(self, close: str, sort: bool) -> None:
+        self.close = close
+        self.fresh = True
+        self.members: Optional[list] = [] if sort else None
+        self.key: Optional[str] = None
+
+def reformat(chunks: Iterable[str], indent: Optional[int] = 2, sort_keys: bool = False) -> Iterator[str]:
+    """Re-emit a JSON document from a stream of text chunks.
+
+    indent=None minifies. Output is yielded in batches as soon as it is
+    known; with sort_keys each object is buffered until it closes.
+    Raises JSONStreamError at the first syntax error.
+    """
+    nl = "\n" if indent is not None else ""
+    pad = " " * (indent or 0)
+    colon = ": " if indent is not None else ":"
+    out: List[str] = []
+    sinks: List[List[str]] = [out]
+    stack: List[_Frame] = []
+    state = VALUE
+    source = iter(chunks)
+    buf, pos, base, final = "", 0, 0, False
+    line, line_start = 1, 0
+
+    def fail(msg: str, at: int) -> JSONStreamError:
+        n = buf.count("\n", 0, at)
+        ln, start = line + n, (base + buf.rindex("\n", 0, at) + 1) if n else line_start
+        return JSONStreamError(msg, base + at, ln, base + at - start + 1)
+
+    def finish_member(frame: _Frame) -> None:
+        value = "".join(sinks.pop())
+        frame.members.append((json.loads(frame.key), frame.key, value))
+
+    while True:
+        m = TOKEN.match(buf, pos)
+        # A number may continue past the chunk end ("1" + ".5", "1e" + "+5")
+        if m is None or m.end() + (2 if m.lastgroup == "num" else 0) >= len(buf):
+            at = RE_SPACE.match(buf, pos).end()
+            if not final and (m is not None or at == len(buf) or _maybe_incomplete(buf, at)):
+                # Drop consumed text, keeping line bookkeeping for error reports
+                n = buf.count("\n", 0, pos)
+                if n: line, line_start = line + n, base + buf.rindex("\n", 0, pos) + 1
+                base += pos
+                chunk = next(source, None)
+                if chunk is None: final = True
+                buf, pos = buf[pos:] + (chunk or ""), 0
+                continue
+            if m is None:
+                if at == len(buf):
+                    if state == END: break
+                    raise fail(EXPECTING[state], at)
+                if buf[at] == '"' and state in (VALUE, VALUE_OR_CLOSE, KEY, KEY_OR_CLOSE):
+                    raise _string_error(fail, buf, at)
+                raise fail(EXPECTING[state], at)
+        kind, text = m.lastgroup, m.group(m.lastgroup)
+        start, pos = m.start(kind), m.end()
+        emit = sinks[-1].append
+        frame = stack[-1] if stack else None
+
+        if kind == "punct" and text in ",:]}":
+            if text == ":":
+                if state != COLON: raise fail(EXPECTING[state], start)
+                if frame.members is None: emit(colon)
+                state = VALUE
+            elif text == ",":
+                if state != COMMA_OR_CLOSE: raise fail(EXPECTING[state], start)
+                if frame.members is not None: finish_member(frame)
+                else: emit("," + nl + pad * len(stack))
+                state = KEY if frame.close == "}" else VALUE
+            else:
+                if not frame or frame.close != text or state not in (COMMA_OR_CLOSE, KEY_OR_CLOSE, VALUE_OR_CLOSE):
+                    raise fail(EXPECTING[state], start)
+                stack.pop()
+                if frame.members is not None:
+                    if not frame.fresh: finish_member(frame)
+                    frame.members.sort(key=lambda item: item[0])
+                    inner = nl + pad * (len(stack) + 1)
+                    body = ",".join(f"{inner}{key}{colon}{value}" for _, key, value in frame.members)
+                    sinks[-1].append("{" + body + nl + pad * len(stack) + "}" if body else "{}")
+                elif frame.fresh: emit(text)
+                else: emit(nl + pad * len(stack) + text)
+                state = COMMA_OR_CLOSE if stack else END
+        else:
+            is_key = state in (KEY, KEY_OR_CLOSE)
+            if is_key and kind != "str": raise fail(EXPECTING[state], start)
+            if not is_key and state not in (VALUE, VALUE_OR_CLOSE): raise fail(EXPECTING[state], start)
+            if frame and frame.fresh:
+                frame.fresh = False
+                if frame.members is None: emit(nl + pad * len(stack))
+            if is_key:
+                if frame.members is not None:
+                    frame.key = text
+                    sinks.append([])
+                else: emit(text)
+                state = COLON
+            elif text == "{" or text == "[":
+                child = _Frame("}" if text == "{" else "]", sort_keys and text == "{")
+                stack.append(child)
+                if child.members is None: emit(text)
+                state = KEY_OR_CLOSE if text == "{" else VALUE_OR_CLOSE
+            else:
+                emit(text)
+                state = COMMA_OR_CLOSE if stack else END
+        if len(sinks) == 1 and len(out) >= JSON_FLUSH_PIECES:
+            yield "".join(out)
+            out.clear()
+    if out: yield "".join(out)
+
+def _maybe_incomplete(buf: str, at: int) -> bool:
+    """True if the failure at `at` could be a token cut off by the chunk end."""
+    if buf[at] == '"': return RE_LOOSE_STRING.match(buf, at) is None
+    return len(buf) - at < 8
+
+def _string_error(fail, buf: str, at: int) -> JSONStreamError:
+    """Walk the string like json.scanner and report the first part it cannot consume."""
+    pos, last, match = at + 1, at + 1, RE_STRING_PART.match
+    m = match(buf, pos)
+    while m:
+        last, pos = pos, m.end()
+        m = match(buf, pos)
+    # Like json.scanner, a \uXXXX escape that ends the input counts as invalid
+    if pos == len(buf) and buf.startswith("\\u", last): return fail("Invalid \\uXXXX escape", last + 1)
+    if pos + (buf[pos:pos + 1] == "\\") >= len(buf) or buf[pos] == '"':
+        return fail("Unterminated string starting at", at)
+    if buf[pos] != "\\": return fail("Invalid control character at", pos)
+    if buf[pos + 1] == "u": return fail("Invalid \\uXXXX escape", pos + 1)
+    return fail("Invalid \\escape", pos)
+
+def _reject_constant(name: str) -> None:
+    raise ValueError(f"{name} is not JSON")
+
+def format_text(text: str, mode: str = "Pretty", chunk_size: int = 1 << 16) -> Iterator[str]:
+    """Reformat an in-memory string in `chunk_size` pieces (see MODES).
+
+    Documents up to JSON_STDLIB_CHARS go through json.loads/dumps in one
+    piece; the token stream takes larger ones and anything the stdlib
+    cannot round-trip (NaN, overflowing floats, huge ints, deep nesting,
+    lone surrogates).
+    """
+    indent, sort_keys = MODES.get(mode, MODES["Pretty"])
+    if len(text) <= JSON_STDLIB_CHARS and not RE_LONE_SURROGATE.search(text):
+        try:
+            obj = json.loads(text, parse_constant=_reject_constant)
+            separators = None if indent is not None else (",", ":")
+            return iter([json.dumps(obj, indent=indent, sort_keys=sort_keys, separators=separators,
+                                    ensure_ascii=False, allow_nan=False)])
+        except json.JSONDecodeError: raise
+        except (ValueError, RecursionError): pass  # Let the tokenizer accept or report it
+    chunks = (text[i:i + chunk_size] for i in range(0, len(text), chunk_size))
+    return reformat(chunks, indent, sort_keys)
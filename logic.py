@@ -2,23 +2,38 @@
 Gardio Core Logic
 Optimized, strictly typed helper functions.
 """
-import random
-import json
-import re
-import difflib
-import base64
-import urllib.parse
-from datetime import datetime
-from collections import Counter
-from typing import Tuple, List, Any
-
-from constants import STOP_WORDS, JOKES, QUOTES, RE_NUMBERS, RE_URLS, VERSION
+import html
+import time
+import logging
+import itertools
+from typing import Tuple, List, Any, Optional, Iterator, Union
+
+import chat
+import metrics
+import stats
+from startup import lazy_import
+from cache import memoize, memoize_live, memoize_stream
+from stats import TextStats
+from incremental import LiveStats, LiveDedup, LiveMatches
+from constants import (RE_NUMBERS, RE_URLS, MAX_TEXT_LENGTH, TOP_KEYWORDS, STREAM_INTERVAL, REPLACE_PREVIEW_LIMIT, DIFF_STREAM_ROWS,
+                       CORPUS_STOP_LIST, CORPUS_MAX_CHARS, CORPUS_KEYWORDS, CORPUS_TOP_TERMS, CORPUS_TABLE_ROWS)
+
+# Engines behind a button load on first use, keeping cold start short
+diff = lazy_import("diff")
+dedup = lazy_import("dedup")
+extract = lazy_import("extract")
+files = lazy_import("files")
+jsonstream = lazy_import("jsonstream")
+replacer = lazy_import("replace")
+codec = lazy_import("codec")
+corpus = lazy_import("corpus")    # NumPy loads with it; never offloaded, so not preloaded in workers
+ENGINES = ("diff", "dedup", "extract", "files", "jsonstream", "replace", "codec")
 
 def validate_text(text: str) -> Tuple[bool, str]:
     """Validate text input. Returns (is_valid, cleaned_text)."""
     if text is None: return False, ""
     cleaned = text.strip()
-    return (True, cleaned[:50000]) if cleaned else (False, "")
+    return (True, cleaned[:MAX_TEXT_LENGTH]) if cleaned else (False, "")
 
 def html_empty(message: str = "Enter text to begin...") -> str:
     return f'<div class="empty-state">📝 {message}</div>'
@@ -26,58 +41,186 @@ def html_empty(message: str = "Enter text to begin...") -> str:
 def html_error(message: str = "An error occurred") -> str:
     return f'<div class="error-state">⚠️ {message}</div>'
 
+log = logging.getLogger("gardio")
+
+def _report(tool: str, error: BaseException) -> None:
+    """Log and count a failure a handler turns into an error message."""
+    log.warning("%s failed: %r", tool, error, exc_info=log.isEnabledFor(logging.DEBUG))
+    metrics.record_error(tool, error)
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 📊 ANALYTICS
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
+def html_stats(result: TextStats) -> str:
+    return f"""
+        <div class="stats-grid">
+            <div class="stat-card"><span class="label">Characters</span><span class="value">{result.chars:,}</span></div>
+            <div class="stat-card"><span class="label">Words</span><span class="value">{result.words:,}</span></div>
+            <div class="stat-card"><span class="label">Lines</span><span class="value">{result.lines:,}</span></div>
+            <div class="stat-card"><span class="label">Avg Length</span><span class="value">{result.avg_len:.1f}</span></div>
+            <div class="stat-card highlight"><span class="label">Read Time</span><span class="value">{result.read_time}m</span></div>
+        </div>
+        """
+
+def html_frequency(result: TextStats, top_n: int = TOP_KEYWORDS) -> str:
+    if not result.keywords: return html_empty("No significant words found")
+    total = result.keywords
+    html = '<div class="freq-panel"><p class="freq-note">Stop words filtered</p>'
+    for i, (word, count) in enumerate(result.top(top_n), 1):
+        pct = (count / total) * 100
+        html += f'<div class="freq-row"><span class="rank">#{i}</span><span class="word">{word}</span><span class="count">{count}</span><div class="bar-bg"><div class="bar-fill" style="width:{pct}%"></div></div></div>'
+    html += '</div>'
+    return html
+
+@memoize("analyze_text")
 def analyze_text(text: str) -> str:
     """Analyze text and return statistics HTML."""
     is_valid, cleaned = validate_text(text)
     if not is_valid: return html_empty("Enter text to see analytics...")
     
     try:
-        words = cleaned.split()
-        word_count = len(words)
-        chars = len(cleaned)
-        lines = len(cleaned.splitlines())
-        avg_len = sum(len(w) for w in words) / word_count if word_count else 0
-        read_time = round(word_count / 200, 1)
-        
-        return f"""
-        <div class="stats-grid">
-            <div class="stat-card"><span class="label">Characters</span><span class="value">{chars:,}</span></div>
-            <div class="stat-card"><span class="label">Words</span><span class="value">{word_count:,}</span></div>
-            <div class="stat-card"><span class="label">Lines</span><span class="value">{lines:,}</span></div>
-            <div class="stat-card"><span class="label">Avg Length</span><span class="value">{avg_len:.1f}</span></div>
-            <div class="stat-card highlight"><span class="label">Read Time</span><span class="value">{read_time}m</span></div>
-        </div>
-        """
-    except Exception: return html_error("Analysis failed")
+        return html_stats(stats.scan(cleaned))
+    except Exception as e:
+        _report("analyze_text", e)
+        return html_error("Analysis failed")
 
+@memoize("count_frequency")
 def count_frequency(text: str) -> str:
     """Count word frequency."""
     is_valid, cleaned = validate_text(text)
     if not is_valid: return html_empty()
     
     try:
-        # Optimized: Lowercase once, then split. Using standard string translation for speed could be added but regex is fine.
-        # Actually, split then filter is efficient.
-        words = re.sub(r'[^\w\s]', '', cleaned.lower()).split()
-        filtered = [w for w in words if w not in STOP_WORDS and len(w) > 1]
-        
-        if not filtered: return html_empty("No significant words found")
-        
-        top_5 = Counter(filtered).most_common(5)
-        total = len(filtered)
-        
-        html = '<div class="freq-panel"><p class="freq-note">Stop words filtered</p>'
-        for i, (word, count) in enumerate(top_5, 1):
-            pct = (count / total) * 100
-            html += f'<div class="freq-row"><span class="rank">#{i}</span><span class="word">{word}</span><span class="count">{count}</span><div class="bar-bg"><div class="bar-fill" style="width:{pct}%"></div></div></div>'
-        html += '</div>'
-        return html
-    except Exception: return html_error()
-    
+        result = TextStats()
+        result.add_keywords(cleaned)  # The panel shows no totals, so skip counting them
+        return html_frequency(result)
+    except Exception as e:
+        _report("count_frequency", e)
+        return html_error()
+
+# Live variants for keystroke-driven `.change` handlers: session state
+# carries the previous text so only the edited lines are re-tokenized.
+# They share cache keys with the button handlers (same text, same HTML).
+
+@memoize_live("analyze_text")
+def analyze_text_live(text: str, state: Optional[LiveStats]) -> Tuple[str, LiveStats]:
+    is_valid, cleaned = validate_text(text)
+    if not is_valid: return html_empty("Enter text to see analytics..."), LiveStats(keywords=False)
+    try:
+        state = (state or LiveStats(keywords=False)).update(cleaned)
+        return html_stats(state.result), state
+    except Exception as e:
+        _report("analyze_text_live", e)
+        return html_error("Analysis failed"), LiveStats(keywords=False)
+
+@memoize_live("count_frequency")
+def count_frequency_live(text: str, state: Optional[LiveStats]) -> Tuple[str, LiveStats]:
+    is_valid, cleaned = validate_text(text)
+    if not is_valid: return html_empty(), LiveStats()
+    try:
+        state = (state or LiveStats()).update(cleaned)
+        return html_frequency(state.result), state
+    except Exception as e:
+        _report("count_frequency_live", e)
+        return html_error(), LiveStats()
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 📚 CORPUS
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def _score(value: float) -> Optional[float]:
+    return round(float(value), 1) if value == value else None  # NaN: no words
+
+def html_corpus(index: "corpus.Corpus", stop: str = CORPUS_STOP_LIST) -> Tuple[str, str, List[list]]:
+    """(summary cards, corpus-wide frequencies, per-document table) for the Corpus tab."""
+    if not len(index): return html_empty("Add documents to build the corpus..."), "", []
+    ease, grade = index.readability(-1)
+    counts = {"Documents": len(index), "Vocabulary": len(index.terms), "Words": index.tokens}
+    if ease[0] == ease[0]: counts.update({"Reading Ease": _score(ease[0]), "Grade": _score(grade[0])})
+    summary = html_counts(counts)
+
+    top = index.frequencies(CORPUS_TOP_TERMS, stop)
+    terms = html_empty("No significant words found")
+    if top:
+        peak = top[0][1]
+        terms = f'<div class="freq-panel"><p class="freq-note">{html.escape(stop)} stop words filtered · count / documents</p>'
+        for i, (word, count, docs) in enumerate(top, 1):
+            terms += f'<div class="freq-row"><span class="rank">#{i}</span><span class="word">{html.escape(word)}</span><span class="count">{count:,} / {docs:,}</span><div class="bar-bg"><div class="bar-fill" style="width:{count / peak * 100}%"></div></div></div>'
+        terms += '</div>'
+
+    shown = min(len(index), CORPUS_TABLE_ROWS)
+    ease, grade = index.readability()
+    near = index.nearest(stop)
+    keywords = index.keywords(CORPUS_KEYWORDS, stop)
+    table = [[d + 1, index.titles[d], int(index.words.view()[d]), _score(ease[d]), _score(grade[d]),
+              ", ".join(word for word, _ in keywords[d]),
+              int(near.doc[d]) + 1 if near.doc[d] >= 0 else None, round(float(near.score[d]), 3)]
+             for d in range(shown)]
+    return summary, terms, table
+
+def corpus_add(text: str, paths: Optional[List[str]], how: str, stop: str,
+               state: Optional["corpus.Corpus"]) -> Tuple[str, str, List[list], Any, str, None]:
+    """Index pasted and uploaded documents into the session's corpus.
+
+    Only the new documents are tokenized; the inputs are cleared so a second
+    click does not add them twice.
+    """
+    index = state if state is not None else corpus.Corpus()
+    text = text or ""
+    if len(text) > CORPUS_MAX_CHARS: return (html_error(f"Text too large (max {CORPUS_MAX_CHARS:,} characters per add)"), "", [], state, text, None)
+    try:
+        index.add(itertools.chain(corpus.split(text, how), corpus.load(paths or (), how)))
+        return (*html_corpus(index, stop), index, "", None)
+    except OSError as e:
+        _report("corpus_add", e)
+        return html_error("Could not read file"), "", [], state, text, None
+    except ValueError as e: return html_error(str(e)), "", [], state, text, None
+
+def corpus_report(stop: str, state: Optional["corpus.Corpus"]) -> Tuple[str, str, List[list]]:
+    """Re-rank under another stop-word list (no re-indexing)."""
+    if state is None: return html_empty("Add documents to build the corpus..."), "", []
+    try: return html_corpus(state, stop)
+    except ValueError as e: return html_error(str(e)), "", []
+
+def corpus_clear() -> Tuple[str, str, List[list], None]:
+    return html_empty("Add documents to build the corpus..."), "", [], None
+
+def corpus_compare(doc: Optional[float], stop: str, state: Optional["corpus.Corpus"]) -> str:
+    """One document's keywords and readability, and its closest documents."""
+    if state is None or not len(state): return html_empty("Add documents to compare...")
+    if doc is None or not 1 <= int(doc) <= len(state): return html_error(f"Pick a document between 1 and {len(state):,}")
+    d = int(doc) - 1
+    try:
+        ease, grade = state.readability(d)
+        keywords = ", ".join(f"{html.escape(word)} ({weight:.3f})" for word, weight in state.keywords_of(d, CORPUS_KEYWORDS, stop)) or "—"
+        rows = "".join(f'<div class="freq-row"><span class="rank">#{e + 1}</span><span class="word">{html.escape(state.titles[e])}</span><span class="count">{score:.3f}</span></div>'
+                       for e, score in state.similar(d, CORPUS_KEYWORDS, stop)) or html_empty("No shared keywords")
+    except ValueError as e: return html_error(str(e))
+    readability = "" if ease[0] != ease[0] else f" · Reading ease {ease[0]:.1f} · Grade {grade[0]:.1f}"
+    return (f'<div class="freq-panel"><p class="freq-note"><b>#{d + 1}</b> {html.escape(state.titles[d])}{readability}</p>'
+            f'<p class="freq-note">Keywords: {keywords}</p>{rows}</div>')
+
+def corpus_summary(documents: List[str], stop: str = CORPUS_STOP_LIST, keywords: int = CORPUS_KEYWORDS) -> List[dict]:
+    """Index `documents` in one go; per-document keywords, readability and the
+    0-based index of the most similar document (-1 if none shares a keyword)."""
+    index = corpus.build(["" if d is None else str(d) for d in documents])
+    if not len(index): return []
+    ease, grade = index.readability()
+    near = index.nearest(stop)
+    return [{"keywords": [word for word, _ in words], "words": int(index.words.view()[d]),
+             "reading_ease": _score(ease[d]), "grade": _score(grade[d]),
+             "most_similar": int(near.doc[d]), "similarity": round(float(near.score[d]), 4)}
+            for d, words in enumerate(index.keywords(keywords, stop))]
+
+def corpus_api(documents: List[str], stop_words: str = CORPUS_STOP_LIST, keywords: int = CORPUS_KEYWORDS) -> List[dict]:
+    """Gradio endpoint (/corpus): corpus_summary() with bad input surfaced as gr.Error."""
+    try:
+        return corpus_summary(documents, stop_words, keywords)
+    except (ValueError, TypeError) as e:
+        import gradio as gr
+        raise gr.Error(str(e))
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 🛠️ TOOLS
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -94,50 +237,204 @@ def calculate(a: float, op: str, b: float) -> str:
         
         # Return int if it's a whole number
         return str(int(res)) if isinstance(res, (int, float)) and res == int(res) else f"{res:.4g}"
-    except Exception: return "Error"
+    except Exception as e:
+        _report("calculate", e)
+        return "Error"
 
 def extract_numbers(text: str) -> str:
-    return ", ".join(RE_NUMBERS.findall(text)) if text else ""
+    return ", ".join(extract.findall(text, "number")) if text else ""
 
 def extract_urls(text: str) -> str:
-    return "\n".join(RE_URLS.findall(text)) if text else ""
+    return "\n".join(extract.findall(text, "url")) if text else ""
+
+def extract_all(text: str, kinds: Optional[List[str]] = None) -> str:
+    """One finditer scan per selected kind, merged in text order, then grouped by kind."""
+    if not text: return ""
+    try:
+        found = extract.group(extract.scan(text, kinds or None))
+    except ValueError as e: return f"Error: {str(e)}"
+    return "\n\n".join(f"{kind.upper()} ({len(values)})\n" + "\n".join(values) for kind, values in found.items())
     
-def remove_duplicates(text: str) -> str:
+def remove_duplicates(text: str, mode: str = "exact", keep: str = "first",
+                      ignore_case: bool = False, ignore_whitespace: bool = False) -> str:
     if not text: return ""
-    # Optimized: Set seen tracking in list comp
-    seen = set()
-    return "\n".join([x for x in text.splitlines() if not (x in seen or seen.add(x))])
+    lines = text.splitlines()
+    # Size the Bloom filter from the input, not DEDUP_BLOOM_CAPACITY (~18 MB per call)
+    return "\n".join(dedup.dedup(lines, mode, keep, ignore_case, ignore_whitespace, capacity=max(len(lines), 1024)))
+
+def remove_duplicates_with(text: str, labels: List[str]) -> str:
+    """Duplicates tab with options selected (see DEDUP_OPTIONS)."""
+    if not text: return ""
+    try:
+        return remove_duplicates(text, **dedup.options(labels))
+    except ValueError as e: return f"Error: {str(e)}"
+
+@memoize_live("remove_duplicates_live")
+def remove_duplicates_live(text: str, state: Optional[LiveDedup]) -> Tuple[str, LiveDedup]:
+    if not text: return "", LiveDedup()
+    state = (state or LiveDedup()).update(text)
+    return state.output(), state
+
+@memoize_live("extract_numbers_live")
+def extract_numbers_live(text: str, state: Optional[LiveMatches]) -> Tuple[str, LiveMatches]:
+    if not text: return "", LiveMatches(RE_NUMBERS)
+    state = (state or LiveMatches(RE_NUMBERS)).update(text)
+    return state.output(", "), state
+
+@memoize_live("extract_urls_live")
+def extract_urls_live(text: str, state: Optional[LiveMatches]) -> Tuple[str, LiveMatches]:
+    if not text: return "", LiveMatches(RE_URLS)
+    state = (state or LiveMatches(RE_URLS)).update(text)
+    return state.output("\n"), state
+
+def html_counts(counts: dict) -> str:
+    if not counts: return html_empty("Nothing found")
+    cards = "".join(f'<div class="stat-card"><span class="label">{label}</span><span class="value">{value:,}</span></div>' for label, value in counts.items())
+    return f'<div class="stats-grid">{cards}</div>'
+
+def process_file(path: Optional[str], tool: str, find: str = "", replace: str = "",
+                 dedup_labels: Optional[List[str]] = None) -> Tuple[str, Optional[str]]:
+    """File mode: stream an uploaded file through a tool (no textbox cap)."""
+    if not path: return html_empty("Upload a file to begin..."), None
+    try:
+        if tool == "Analyze": return html_stats(files.analyze(path)), None
+        if tool == "Frequency": return html_frequency(files.analyze(path, keywords=True)), None
+        if tool == "Duplicates": counts, out = files.remove_duplicates(path, **dedup.options(dedup_labels))
+        elif tool == "Numbers": counts, out = files.extract_matches(path, ["number"])
+        elif tool == "URLs": counts, out = files.extract_matches(path, ["url"])
+        elif tool == "Extract All": counts, out = files.extract_matches(path)
+        elif tool == "Replace":
+            if not find: return html_empty("Enter text to find..."), None
+            counts, out = files.find_replace(path, find, replace)
+        elif tool == "List": counts, out = files.text_to_list(path)
+        else: return html_error(f"Unknown tool: {tool}"), None
+        return html_counts(counts), out
+    except OSError as e:
+        _report("process_file", e)
+        return html_error("Could not read file"), None
+    except ValueError as e: return html_error(str(e)), None
 
 def find_replace(text: str, find: str, replace: str) -> str:
     return text.replace(find, replace) if text and find else text
 
-def format_json(text: str) -> str:
+def _rules(find: str, replace: str, rows: Optional[List[list]]) -> list:
+    # The quick Find/Replace pair runs as the first rule
+    quick = [replacer.Rule(find, replace or "")] if find else []
+    return quick + replacer.parse_rows(rows)
+
+def apply_rules(text: str, rules: Optional[List[list]] = None) -> str:
+    """Apply rule rows [find, replace, regex, ignore case] in one pass."""
+    parsed = _rules("", "", rules)
+    if not text or not parsed: return text
+    try: return replacer.compile_rules(tuple(parsed)).apply(text)[0]
+    except ValueError as e: return f"Error: {str(e)}"
+
+def replace_rules(text: str, find: str, replace: str, rows: Optional[List[list]],
+                  preview: bool = False) -> Tuple[str, str]:
+    """Multi-rule replace; returns (output, per-rule hit counts).
+
+    With `preview` the output lists the changed spans and their offsets
+    instead of the rewritten text.
+    """
+    parsed = _rules(find, replace, rows)
+    if not text: return "", html_empty()
+    if not parsed: return text, html_empty("Add a rule to begin...")
+    try: ruleset = replacer.compile_rules(tuple(parsed))
+    except ValueError as e: return text, html_error(str(e))
+    if preview:
+        hits, lines = [0] * len(parsed), []
+        for c in ruleset.changes(text):
+            hits[c.rule] += 1
+            if len(lines) < REPLACE_PREVIEW_LIMIT: lines.append(f"{c.start}-{c.end}  #{c.rule + 1}  {c.old!r} → {c.new!r}")
+        if sum(hits) > len(lines): lines.append(f"… {sum(hits) - len(lines):,} more")
+        out = "\n".join(lines)
+    else: out, hits = ruleset.apply(text)
+    counts = {f"#{i + 1} {html.escape(rule.find[:24])}": n for i, (rule, n) in enumerate(zip(parsed, hits))}
+    return out, html_counts(counts)
+
+@memoize("format_json")
+def format_json(text: str, mode: str = "Pretty") -> str:
     if not text: return ""
     try:
-        return json.dumps(json.loads(text), indent=2)
-    except Exception as e:
+        return "".join(jsonstream.format_text(text, mode))
+    except ValueError as e:
         return f"Invalid JSON: {str(e)}"
 
+@memoize_stream("format_json")  # Final text equals format_json()
+def format_json_stream(text: str, mode: str = "Pretty") -> Iterator[str]:
+    """Yield progress notes while formatting, then the document once; errors report line/column.
+
+    Interim updates carry only a size, never a snapshot of the output, so
+    large documents are not re-joined (and re-pickled from workers) per tick.
+    """
+    if not text:
+        yield ""
+        return
+    parts: List[str] = []
+    size, last = 0, time.monotonic()
+    try:
+        for piece in jsonstream.format_text(text, mode):
+            parts.append(piece)
+            size += len(piece)
+            if time.monotonic() - last > STREAM_INTERVAL:
+                last = time.monotonic()
+                yield f"⏳ Formatting… {size:,} characters so far"
+    except ValueError as e:
+        yield f"Invalid JSON: {str(e)}"
+        return
+    yield "".join(parts)
+
+@memoize("diff_text")
 def diff_text(text_a: str, text_b: str) -> str:
     if not text_a or not text_b: return ""
-    diff = difflib.unified_diff(
-        text_a.splitlines(), 
-        text_b.splitlines(), 
-        lineterm="", 
-        fromfile="Text A", 
-        tofile="Text B"
-    )
-    return "\n".join(diff)
-
-def encode_decode(text: str, mode: str) -> str:
-    if not text: return ""
-    try:
-        if mode == "Base64 Encode": return base64.b64encode(text.encode()).decode()
-        elif mode == "Base64 Decode": return base64.b64decode(text).decode()
-        elif mode == "URL Encode": return urllib.parse.quote(text)
-        elif mode == "URL Decode": return urllib.parse.unquote(text)
-    except Exception: return "Error"
-    return ""
+    a, b = text_a.splitlines(), text_b.splitlines()
+    return "\n".join(diff.unified(a, b, diff.hunks(a, b)))
+
+@memoize_stream("diff_stream")
+def diff_stream(text_a: str, text_b: str) -> Iterator[Tuple[str, str]]:
+    """Stream (unified, side-by-side HTML) as hunks are computed.
+
+    Interim updates carry a progress note and at most DIFF_STREAM_ROWS hunks,
+    so each tick costs the same however large the diff grows; the full
+    result is joined once at the end.
+    """
+    if not text_a or not text_b:
+        yield "", html_empty("Enter both texts to compare...")
+        return
+    a, b = text_a.splitlines(), text_b.splitlines()
+    budget = diff.Budget()
+    lines: List[str] = ["--- Text A", "+++ Text B"]
+    rows: List[str] = []
+    preview, last = "", time.monotonic()
+    for group in diff.hunks(a, b, budget):
+        lines.extend(diff.unified_hunk(a, b, group))
+        rows.append(diff.side_by_side(a, b, group))
+        if time.monotonic() - last > STREAM_INTERVAL:
+            last = time.monotonic()
+            # The capped preview stops changing once full, so build it only until then
+            if not preview or len(rows) <= DIFF_STREAM_ROWS: preview = _html_diff(rows[:DIFF_STREAM_ROWS], budget, done=False)
+            yield f"⏳ Comparing… {len(rows):,} hunks so far", preview
+    if not rows:
+        yield "", html_empty("No differences found")
+        return
+    yield "\n".join(lines), _html_diff(rows, budget, done=True)
+
+def _html_diff(rows: List[str], budget: "diff.Budget", done: bool) -> str:
+    note = "" if done else '<p class="diff-note">Comparing…</p>'
+    if budget.degraded: note += '<p class="diff-note">Large change set: some regions are shown as whole-block replacements.</p>'
+    return f'<div class="diff-panel">{note}<table class="diff-table">{"".join(rows)}</table></div>'
+
+@memoize("encode_decode")
+def encode_decode(text: str, mode: Union[str, List[str]]) -> str:
+    """Run `text` through one codec or a chain ("Gzip Compress → Base64 Encode")."""
+    if not text or not mode: return ""
+    try: return codec.convert(text.encode("utf-8", "surrogatepass"), mode).decode("utf-8")
+    except UnicodeDecodeError as e:
+        return f"Error: output is binary (not UTF-8 at byte {e.start}); end the chain with Base64 or Hex Encode"
+    except ValueError as e: return f"Error: {str(e)}"
+    except Exception as e:
+        _report("encode_decode", e)
+        return "Error"
 
 def text_to_list(text: str) -> str:
     return str([l.strip() for l in text.splitlines() if l.strip()]) if text else "[]"
@@ -155,28 +452,22 @@ def text_to_dict(text: str) -> str:
 # 💬 CHAT
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-def chat_respond(message: str, history: List[dict]) -> Tuple[List[dict], str]:
+def chat_restore(chat_id: str, session: str = "") -> Tuple[List[dict], str]:
+    """Chatbot contents on page load, read back from chat.STORE. A browser
+    without a chat id adopts its session hash as one (kept in BrowserState)."""
+    key = chat_id or session
+    return chat.STORE.history(key), key
+
+def chat_respond(message: str, session: str = "") -> Tuple[List[dict], str]:
+    """Reply to one message. Returns only the new turn; the session's
+    bounded history is kept server-side in chat.STORE."""
     try:
         is_valid, cleaned = validate_text(message)
-        if not is_valid: return history, ""
-        msg_lower = cleaned.lower()
-        
-        resp = "🤔 Try 'help' for commands!"
-        
-        if any(x in msg_lower for x in ["hello", "hi", "hey"]): resp = "Hello! 👋"
-        elif "hola" in msg_lower: resp = "¡Hola! 👋"
-        elif "bonjour" in msg_lower: resp = "Bonjour! 👋"
-        elif "namaste" in msg_lower: resp = "नमस्ते! 🙏"
-        elif "version" in msg_lower:
-            resp = f"📦 **Gardio v{VERSION}**\n• Gradio 6.1.0\n• Python 3.10+"
-        elif "help" in msg_lower: resp = "**Commands:** hello, version, time, date, joke, quote, tips, bye"
-        elif "time" in msg_lower: resp = f"🕐 **{datetime.now().strftime('%H:%M:%S')}**"
-        elif "date" in msg_lower: resp = f"📅 **{datetime.now().strftime('%A, %B %d, %Y')}**"
-        elif "joke" in msg_lower: resp = random.choice(JOKES)
-        elif "quote" in msg_lower: resp = random.choice(QUOTES)
-        elif "tips" in msg_lower: resp = "💡 Try the new JSON Formatter and Turbo tools!"
-        
-        history.append({"role": "user", "content": cleaned})
-        history.append({"role": "assistant", "content": resp})
-        return history, ""
-    except Exception: return history, ""
+        if not is_valid: return [], ""
+        turn = [{"role": "user", "content": cleaned}, {"role": "assistant", "content": chat.reply(cleaned)}]
+        # No id yet (sent before the page finished loading): reply without storing
+        if session: chat.STORE.append(session, *turn)
+        return turn, ""
+    except Exception as e:
+        _report("chat_respond", e)
+        return [], ""
@@ -0,0 +1,256 @@
+"""
+Gardio Metrics
+Per-handler call/latency/payload/queue/error instrumentation, exported in
+Prometheus text format, plus a sampling profiler for the slowest calls.
+"""
+import time
+import random
+import inspect
+import functools
+import threading
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from constants import METRICS_BUCKETS, PROFILE_SAMPLE_RATE, PROFILE_KEEP
+
+if TYPE_CHECKING: import cProfile  # Annotations only; loaded lazily in _profiler()
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics)."""
+
+    def __init__(self, buckets: Tuple[float, ...] = METRICS_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        i = 0
+        while i < len(self.buckets) and value > self.buckets[i]: i += 1
+        self.counts[i] += 1
+        self.total += value
+        self.count += 1
+
+class HandlerMetrics:
+    __slots__ = ("calls", "errors", "latency", "queue", "bytes_in", "bytes_out")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors: Counter = Counter()
+        self.latency = Histogram()
+        self.queue = Histogram()
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+_lock = threading.Lock()
+REGISTRY: Dict[str, HandlerMetrics] = {}
+SLOWEST: List[Tuple[float, str, str]] = []   # (seconds, handler, pstats text)
+
+def _get(name: str) -> HandlerMetrics:
+    if name not in REGISTRY: REGISTRY[name] = HandlerMetrics()
+    return REGISTRY[name]
+
+def payload_size(value: Any) -> int:
+    if isinstance(value, (str, bytes)): return len(value)
+    if isinstance(value, (list, tuple)): return sum(payload_size(v) for v in value)
+    if isinstance(value, dict): return sum(payload_size(v) for v in value.values())
+    return 0
+
+def record(name: str, seconds: float, bytes_in: int = 0, bytes_out: int = 0,
+           queued: Optional[float] = None, error: Optional[BaseException] = None) -> None:
+    with _lock:
+        m = _get(name)
+        m.calls += 1
+        m.latency.observe(seconds)
+        m.bytes_in += bytes_in
+        m.bytes_out += bytes_out
+        if queued is not None: m.queue.observe(queued)
+        if error is not None: m.errors[type(error).__name__] += 1
+
+def record_error(name: str, error: BaseException) -> None:
+    """Count an exception a tool handled itself (e.g. to show an error card)."""
+    with _lock: _get(name).errors[type(error).__name__] += 1
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 🔬 PROFILER
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def _keep_profile(name: str, seconds: float, profiler: "cProfile.Profile") -> None:
+    import io
+    import pstats
+    with _lock:
+        if len(SLOWEST) >= PROFILE_KEEP and seconds <= SLOWEST[-1][0]: return
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(15)
+    with _lock:
+        SLOWEST.append((seconds, name, out.getvalue()))
+        SLOWEST.sort(key=lambda item: -item[0])
+        del SLOWEST[PROFILE_KEEP:]
+
+def _profiler() -> Optional["cProfile.Profile"]:
+    if PROFILE_SAMPLE_RATE <= 0 or random.random() >= PROFILE_SAMPLE_RATE: return None
+    import cProfile  # Only loaded once sampling is switched on
+    profiler = cProfile.Profile()
+    try: profiler.enable()
+    except ValueError: return None  # Another profiler is already active on this thread
+    return profiler
+
+def _finish_profile(name: str, seconds: float, profiler: Optional["cProfile.Profile"]) -> None:
+    if profiler is None: return
+    profiler.disable()
+    _keep_profile(name, seconds, profiler)
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 🎁 WRAPPERS
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def _received(request: Any) -> Optional[float]:
+    """Wall time the queue/join request arrived (stamped by QueueStampMiddleware)."""
+    try: return request.request.state.gardio_received
+    except AttributeError: return None
+
+def instrument(name: str, fn: Callable) -> Callable:
+    """Wrap a Gradio handler (sync/async, plain/generator) with metrics.
+
+    A `request: gr.Request` parameter is appended to the signature so Gradio
+    passes the request, which carries the time the event was queued.
+    """
+    import gradio as gr  # Deferred: logic workers import this module too
+
+    sig = inspect.signature(fn)
+    passthrough = "request" in sig.parameters  # fn takes the request itself
+
+    def split(args: tuple, kwargs: dict) -> Tuple[tuple, dict, Optional[float], int]:
+        request = kwargs.get("request") if passthrough else kwargs.pop("request", None)
+        if request is None and args and isinstance(args[-1], gr.Request):
+            request = args[-1]
+            if not passthrough: args = args[:-1]
+        stamp = _received(request)
+        queued = max(time.time() - stamp, 0.0) if stamp else None
+        return args, kwargs, queued, payload_size(args)
+
+    if inspect.isasyncgenfunction(fn):
+        async def wrapper(*args, **kwargs):
+            args, kwargs, queued, size = split(args, kwargs)
+            start, out, error = time.perf_counter(), 0, None
+            try:
+                async for update in fn(*args, **kwargs):
+                    out = payload_size(update)
+                    yield update
+            except BaseException as e:
+                error = e
+                raise
+            finally: record(name, time.perf_counter() - start, size, out, queued, error)
+    elif inspect.isgeneratorfunction(fn):
+        def wrapper(*args, **kwargs):
+            args, kwargs, queued, size = split(args, kwargs)
+            start, out, error, profiler = time.perf_counter(), 0, None, _profiler()
+            try:
+                for update in fn(*args, **kwargs):
+                    out = payload_size(update)
+                    yield update
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                seconds = time.perf_counter() - start
+                _finish_profile(name, seconds, profiler)
+                record(name, seconds, size, out, queued, error)
+    elif inspect.iscoroutinefunction(fn):
+        async def wrapper(*args, **kwargs):
+            args, kwargs, queued, size = split(args, kwargs)
+            start, result, error = time.perf_counter(), None, None
+            try:
+                result = await fn(*args, **kwargs)
+                return result
+            except BaseException as e:
+                error = e
+                raise
+            finally: record(name, time.perf_counter() - start, size, payload_size(result), queued, error)
+    else:
+        def wrapper(*args, **kwargs):
+            args, kwargs, queued, size = split(args, kwargs)
+            start, result, error, profiler = time.perf_counter(), None, None, _profiler()
+            try:
+                result = fn(*args, **kwargs)
+                return result
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                seconds = time.perf_counter() - start
+                _finish_profile(name, seconds, profiler)
+                record(name, seconds, size, payload_size(result), queued, error)
+
+    functools.update_wrapper(wrapper, fn)
+    if not passthrough:
+        params = [p for p in sig.parameters.values() if p.kind not in (p.VAR_POSITIONAL, p.VAR_KEYWORD)]
+        # Positional: Gradio's special_args only injects gr.Request into positional parameters
+        extra = inspect.Parameter("request", inspect.Parameter.POSITIONAL_OR_KEYWORD, default=None, annotation=gr.Request)
+        positional = [p for p in params if p.kind != p.KEYWORD_ONLY]
+        keyword = [p for p in params if p.kind == p.KEYWORD_ONLY]
+        wrapper.__signature__ = sig.replace(parameters=positional + [extra] + keyword)
+        wrapper.__annotations__ = {**getattr(fn, "__annotations__", {}), "request": gr.Request}
+    wrapper._instrumented = True
+    return wrapper
+
+def instrument_blocks(blocks: Any) -> None:
+    """Wrap every Python handler registered on a built gr.Blocks (skips wrapped ones)."""
+    fns = blocks.fns.values() if isinstance(blocks.fns, dict) else blocks.fns
+    for block_fn in fns:
+        if block_fn.fn is None or getattr(block_fn.fn, "_instrumented", False): continue
+        name = getattr(block_fn, "api_name", None) or getattr(block_fn, "name", None) or block_fn.fn.__name__
+        block_fn.fn = instrument(str(name), block_fn.fn)
+
+class QueueStampMiddleware:
+    """ASGI middleware: stamp each request's arrival time into its state."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] == "http": scope.setdefault("state", {})["gardio_received"] = time.time()
+        await self.app(scope, receive, send)
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 📤 EXPORT
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def _histogram_lines(metric: str, label: str, h: Histogram) -> List[str]:
+    lines, running = [], 0
+    for bound, count in zip(h.buckets + (float("inf"),), h.counts):
+        running += count
+        le = "+Inf" if bound == float("inf") else f"{bound:g}"
+        lines.append(f'{metric}_bucket{{{label},le="{le}"}} {running}')
+    lines.append(f"{metric}_sum{{{label}}} {h.total:.6f}")
+    lines.append(f"{metric}_count{{{label}}} {h.count}")
+    return lines
+
+def render() -> str:
+    """All metrics in Prometheus text exposition format."""
+    from cache import RESULTS
+    out = [
+        "# HELP gardio_calls_total Handler invocations.", "# TYPE gardio_calls_total counter",
+    ]
+    with _lock: snapshot = list(REGISTRY.items())
+    for name, m in snapshot: out.append(f'gardio_calls_total{{handler="{name}"}} {m.calls}')
+    out += ["# HELP gardio_errors_total Handler errors by exception type.", "# TYPE gardio_errors_total counter"]
+    for name, m in snapshot:
+        for kind, count in m.errors.items(): out.append(f'gardio_errors_total{{handler="{name}",type="{kind}"}} {count}')
+    out += ["# HELP gardio_input_bytes_total Input payload size.", "# TYPE gardio_input_bytes_total counter"]
+    for name, m in snapshot: out.append(f'gardio_input_bytes_total{{handler="{name}"}} {m.bytes_in}')
+    out += ["# HELP gardio_output_bytes_total Output payload size.", "# TYPE gardio_output_bytes_total counter"]
+    for name, m in snapshot: out.append(f'gardio_output_bytes_total{{handler="{name}"}} {m.bytes_out}')
+    out += ["# HELP gardio_latency_seconds Handler run time.", "# TYPE gardio_latency_seconds histogram"]
+    for name, m in snapshot: out += _histogram_lines("gardio_latency_seconds", f'handler="{name}"', m.latency)
+    out += ["# HELP gardio_queue_seconds Time from request arrival to handler start.", "# TYPE gardio_queue_seconds histogram"]
+    for name, m in snapshot:
+        if m.queue.count: out += _histogram_lines("gardio_queue_seconds", f'handler="{name}"', m.queue)
+    out += ["# HELP gardio_cache Result cache counters.", "# TYPE gardio_cache gauge"]
+    for key, value in RESULTS.stats().items(): out.append(f'gardio_cache{{stat="{key}"}} {value}')
+    return "\n".join(out) + "\n"
+
+def render_profiles() -> str:
+    with _lock: items = list(SLOWEST)
+    if not items: return f"No profiles captured (sample rate {PROFILE_SAMPLE_RATE}).\n"
+    return "\n".join(f"=== {name}: {seconds * 1000:.1f} ms ===\n{text}" for seconds, name, text in items)
@@ -0,0 +1,346 @@
+"""
+Gardio Tool Registry
+Each tool declares its components, events and implementation ("module.function");
+the UI is generated from these specs, and lazy tabs are only built (and their
+implementations imported) when a session first opens them.
+"""
+import inspect
+import functools
+import importlib
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+import gradio as gr
+
+import startup
+from constants import (JSON_MODES, EXTRACT_KINDS, FILE_TOOLS, DEDUP_OPTIONS, TRANSFORM_MODES,
+                       STRING_OPS, ENCODER_MODES, CHAT_HISTORY_MESSAGES, REPLACE_HEADERS, STOP_WORD_LISTS,
+                       CORPUS_STOP_LIST, CORPUS_SPLITS, CORPUS_HEADERS)
+
+class Field(NamedTuple):
+    kind: str                     # gr component class, e.g. "Textbox"
+    args: tuple = ()
+    kwargs: Dict[str, Any] = {}
+
+def field(kind: str, *args, **kwargs) -> Field:
+    return Field(kind, args, kwargs)
+
+class Event(NamedTuple):
+    source: str                   # Field whose listener fires
+    trigger: str                  # "click", "change", "input", "submit", ...; "load" on page load (source ignored)
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+    fn: Optional[str] = None      # "module.function", imported when the tab is built
+    js: Optional[str] = None      # Client-side handler (no server round trip)
+    offload: Optional[str] = None # Run on the process pool under this tool name
+    inline_below: Optional[int] = None
+    session: bool = False         # Append the caller's session_hash to the arguments
+    then: Optional["Event"] = None  # Follow-up step (source is ignored)
+
+class Tool(NamedTuple):
+    label: str
+    fields: Dict[str, Field]
+    events: Tuple[Event, ...] = ()
+    layout: tuple = ()            # Field names; a tuple is a gr.Row, a tuple inside it a gr.Column
+    section: str = "toolbox"      # "main" tab or "toolbox" sub-tab
+    lazy: bool = True             # Build on first open
+    api: Tuple[str, ...] = ()     # Extra "module.function" endpoints (e.g. stateless twins of live handlers)
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 📋 TOOLS
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+TOOLS: Tuple[Tool, ...] = (
+    Tool("💬 Chat", section="main", lazy=False, fields={
+        "chatbot": field("Chatbot", show_label=False, elem_classes="chatbot"),
+        "msg": field("Textbox", placeholder="Say hello...", show_label=False, scale=4),
+        "send": field("Button", "Send", variant="primary", scale=1),
+        "turn": field("JSON", visible=False),
+        "chat_id": field("BrowserState", "", storage_key="gardio_chat_id"),
+    }, layout=("chatbot", ("msg", "send"), "turn", "chat_id"), events=(
+        # History lives server-side under a browser-persisted id; a reload restores it
+        Event("", "load", ("chat_id",), ("chatbot", "chat_id"), fn="logic.chat_restore", session=True),
+    ) + tuple(
+        # Only the new turn is sent and the browser appends it
+        Event(source, trigger, ("msg", "chat_id"), ("turn", "msg"), fn="logic.chat_respond",
+              then=Event("", "then", ("chatbot", "turn"), ("chatbot",),
+                         js=f"(h, t) => (h || []).concat(t || []).slice(-{CHAT_HISTORY_MESSAGES})"))
+        for source, trigger in (("msg", "submit"), ("send", "click"))
+    )),
+    Tool("📊 Analytics", section="main", fields={
+        "text": field("Textbox", lines=6, placeholder="Paste text..."),
+        "analyze": field("Button", "Analyze", variant="primary"),
+        "out": field("HTML"),
+        "state": field("State"),
+    }, layout=((("text", "analyze"), "out"), "state"), events=(
+        Event("text", "change", ("text", "state"), ("out", "state"), fn="logic.analyze_text_live"),
+        Event("analyze", "click", ("text",), ("out",), fn="logic.analyze_text", offload="analyze_text"),
+    )),
+    Tool("📈 Frequency", section="main", fields={
+        "text": field("Textbox", lines=5, placeholder="Enter text..."),
+        "out": field("HTML"),
+        "state": field("State"),
+        "find": field("Button", "Find Keywords", variant="primary"),
+    }, layout=(("text", "out"), "state", "find"), events=(
+        Event("find", "click", ("text",), ("out",), fn="logic.count_frequency", offload="count_frequency"),
+        Event("text", "change", ("text", "state"), ("out", "state"), fn="logic.count_frequency_live"),
+    )),
+    Tool("📚 Corpus", section="main", fields={
+        "docs": field("Textbox", lines=6, placeholder="Paste documents...", label="Documents"),
+        "files": field("File", file_count="multiple", type="filepath", label="Or upload files"),
+        "split": field("Radio", CORPUS_SPLITS, value="Blank line", label="One document per"),
+        "stop": field("Dropdown", list(STOP_WORD_LISTS), value=CORPUS_STOP_LIST, label="Stop words"),
+        "add": field("Button", "Add to Corpus", variant="primary"),
+        "clear": field("Button", "Clear"),
+        "summary": field("HTML"),
+        "terms": field("HTML"),
+        "table": field("Dataframe", headers=CORPUS_HEADERS, interactive=False, wrap=True, label="Documents"),
+        "doc": field("Number", value=1, precision=0, label="Compare document #"),
+        "compare": field("HTML"),
+        "state": field("State"),
+    }, layout=((("docs", "files"), ("split", "stop", ("add", "clear"))), "summary", ("terms", ("doc", "compare")), "table", "state"),
+    events=(
+        # The index lives in session state; Add only tokenizes the new documents
+        Event("add", "click", ("docs", "files", "split", "stop", "state"), ("summary", "terms", "table", "state", "docs", "files"), fn="logic.corpus_add"),
+        Event("stop", "change", ("stop", "state"), ("summary", "terms", "table"), fn="logic.corpus_report"),
+        Event("clear", "click", (), ("summary", "terms", "table", "state"), fn="logic.corpus_clear"),
+        Event("doc", "change", ("doc", "stop", "state"), ("compare",), fn="logic.corpus_compare"),
+    )),
+
+    # Client-Side Tools (Turbo) ⚡
+    Tool("⚡ Transform", lazy=False, fields={
+        "text": field("Textbox", label="Input", lines=3),
+        "mode": field("Radio", TRANSFORM_MODES, value="Reverse", label="Transformation"),
+        "out": field("Textbox", label="Output (Instant)", lines=3),
+        "go": field("Button", "Transform", variant="primary"),
+    }, events=tuple(
+        Event(source, trigger, ("text", "mode"), ("out",), js="(t, m) => js_logic.transform(t, m)")
+        for source, trigger in (("text", "change"), ("mode", "change"), ("go", "click"))
+    )),
+    Tool("⚡ Word Counter", fields={
+        "text": field("Textbox", label="Typing...", lines=4),
+        "total": field("Textbox", label="Total"),
+        "unique": field("Textbox", label="Unique"),
+        "longest": field("Textbox", label="Longest"),
+        "avg": field("Textbox", label="Avg Len"),
+    }, layout=("text", ("total", "unique", "longest", "avg")), events=(
+        Event("text", "input", ("text",), ("total", "unique", "longest", "avg"), js="(t) => js_logic.wordCount(t)"),
+    )),
+    Tool("⚡ Trimmer", fields={
+        "text": field("Textbox", label="Input", lines=4),
+        "out": field("Textbox", label="Output", lines=4),
+    }, events=(Event("text", "input", ("text",), ("out",), js="(t) => js_logic.trim(t)"),)),
+    Tool("⚡ String", fields={
+        "text": field("Textbox", label="Input"),
+        "op": field("Radio", STRING_OPS, value="Length", label="Operation"),
+        "out": field("Textbox", label="Result"),
+    }, events=tuple(
+        Event(source, "change", ("text", "op"), ("out",), js="(t, o) => js_logic.stringOps(t, o)") for source in ("text", "op")
+    )),
+
+    # Server-Side Tools
+    Tool("🔢 Calculator", fields={
+        "a": field("Number", value=0, label="A"),
+        "op": field("Radio", ["+", "-", "×", "÷", "^", "%"], value="+", label="Operator"),
+        "b": field("Number", value=0, label="B"),
+        "out": field("Textbox", label="Result"),
+        "go": field("Button", "Calculate", variant="primary"),
+    }, events=(Event("go", "click", ("a", "op", "b"), ("out",), fn="logic.calculate"),)),
+    Tool("📝 JSON", fields={
+        "text": field("Textbox", lines=6, placeholder='{"key": "value"}', label="Bad JSON"),
+        "mode": field("Radio", JSON_MODES, value="Pretty", label="Mode"),
+        "out": field("Textbox", lines=6, label="Pretty JSON"),
+        "go": field("Button", "Format", variant="primary"),
+    }, events=(Event("go", "click", ("text", "mode"), ("out",), fn="logic.format_json_stream", offload="format_json"),)),
+    Tool("⚖️ Diff", fields={
+        "a": field("Textbox", lines=3, label="Text A"),
+        "b": field("Textbox", lines=3, label="Text B"),
+        "view": field("HTML"),
+        "out": field("Textbox", lines=6, label="Differences"),
+        "go": field("Button", "Compare", variant="primary"),
+    }, events=(Event("go", "click", ("a", "b"), ("out", "view"), fn="logic.diff_stream", offload="diff_stream"),)),
+    Tool("🔐 Encoder", fields={
+        "text": field("Textbox", lines=3, placeholder="Text...", label="Input"),
+        "mode": field("Dropdown", ENCODER_MODES, value=["Base64 Encode"], multiselect=True, label="Pipeline (applied in order)"),
+        "out": field("Textbox", lines=3, label="Output"),
+        "go": field("Button", "Convert", variant="primary"),
+    }, events=(Event("go", "click", ("text", "mode"), ("out",), fn="logic.encode_decode", offload="encode_decode"),)),
+
+    # Standard Tools
+    Tool("🧹 Duplicates", fields={
+        "text": field("Textbox", lines=4, label="Paste Text"),
+        "opts": field("CheckboxGroup", DEDUP_OPTIONS, label="Options"),
+        "out": field("Textbox", lines=4, label="Unique Lines"),
+        "state": field("State"),
+        "go": field("Button", "Remove with Options"),
+    }, events=(
+        Event("text", "change", ("text", "state"), ("out", "state"), fn="logic.remove_duplicates_live"),
+        Event("go", "click", ("text", "opts"), ("out",), fn="logic.remove_duplicates_with", offload="remove_duplicates"),
+    )),
+    Tool("🔢 Numbers", fields={
+        "text": field("Textbox", lines=4, label="Paste Text"),
+        "out": field("Textbox", lines=2, label="Extracted Numbers"),
+        "state": field("State"),
+    }, api=("logic.extract_numbers",), events=(
+        Event("text", "change", ("text", "state"), ("out", "state"), fn="logic.extract_numbers_live"),
+    )),
+    Tool("🔗 URLs", fields={
+        "text": field("Textbox", lines=4, label="Paste Text"),
+        "out": field("Textbox", lines=3, label="Extracted URLs"),
+        "state": field("State"),
+    }, api=("logic.extract_urls",), events=(
+        Event("text", "change", ("text", "state"), ("out", "state"), fn="logic.extract_urls_live"),
+    )),
+    Tool("🧲 Extract", fields={
+        "text": field("Textbox", lines=4, label="Paste Text"),
+        "kinds": field("CheckboxGroup", EXTRACT_KINDS, value=EXTRACT_KINDS, label="Find"),
+        "out": field("Textbox", lines=6, label="Matches"),
+        "go": field("Button", "Extract", variant="primary"),
+    }, events=(Event("go", "click", ("text", "kinds"), ("out",), fn="logic.extract_all"),)),
+    Tool("🔍 Replace", fields={
+        "text": field("Textbox", lines=3, label="Input Text"),
+        "find": field("Textbox", label="Find"),
+        "replace": field("Textbox", label="Replace"),
+        "rules": field("Dataframe", headers=REPLACE_HEADERS, datatype=["str", "str", "bool", "bool"],
+                       type="array", interactive=True, label="More Rules (applied in order, one pass)"),
+        "preview": field("Checkbox", label="Preview changes only"),
+        "out": field("Textbox", lines=3, label="Result"),
+        "hits": field("HTML"),
+        "go": field("Button", "Replace All", variant="primary"),
+    }, layout=("text", ("find", "replace"), "rules", "preview", "out", "hits", "go"), events=(
+        Event("go", "click", ("text", "find", "replace", "rules", "preview"), ("out", "hits"), fn="logic.replace_rules"),
+    )),
+    Tool("📁 Files", fields={
+        "file": field("File", label="Upload (.txt, .log, .csv, .json)", type="filepath"),
+        "tool": field("Radio", FILE_TOOLS, value="Analyze", label="Tool"),
+        "find": field("Textbox", label="Find (Replace only)"),
+        "replace": field("Textbox", label="Replace with"),
+        "dedup": field("CheckboxGroup", DEDUP_OPTIONS, label="Dedup Options (Duplicates only)"),
+        "summary": field("HTML"),
+        "out": field("File", label="Download Result"),
+        "go": field("Button", "Process", variant="primary"),
+    }, layout=("file", "tool", ("find", "replace"), "dedup", "summary", "out", "go"), events=(
+        # File paths are tiny, so always run on the pool
+        Event("go", "click", ("file", "tool", "find", "replace", "dedup"), ("summary", "out"),
+              fn="logic.process_file", offload="process_file", inline_below=0),
+    )),
+
+    # Python Data Tools (Simple)
+    Tool("📋 List", fields={
+        "text": field("Textbox", lines=4, label="Items (One per line)"),
+        "out": field("Textbox", lines=2, label="Python List"),
+        "go": field("Button", "Convert"),
+    }, events=(Event("go", "click", ("text",), ("out",), fn="logic.text_to_list"),)),
+    Tool("📦 Tuple", fields={
+        "text": field("Textbox", lines=4, label="Items (One per line)"),
+        "out": field("Textbox", lines=2, label="Python Tuple"),
+        "go": field("Button", "Convert"),
+    }, events=(Event("go", "click", ("text",), ("out",), fn="logic.text_to_tuple"),)),
+    Tool("📖 Dict", fields={
+        "text": field("Textbox", lines=4, label="Key:Value (One per line)"),
+        "out": field("Textbox", lines=2, label="Python Dict"),
+        "go": field("Button", "Convert"),
+    }, events=(Event("go", "click", ("text",), ("out",), fn="logic.text_to_dict"),)),
+)
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 🏗️ BUILDER
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def resolve(path: str) -> Callable:
+    module, _, name = path.rpartition(".")
+    return getattr(importlib.import_module(module), name)
+
+def with_session(fn: Callable) -> Callable:
+    """Call `fn(*inputs, session_hash)`; Gradio supplies the request."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        request = kwargs.pop("request", None)
+        if request is None and args: args, request = args[:-1], args[-1]
+        return fn(*args, getattr(request, "session_hash", None) or "", **kwargs)
+
+    params = list(inspect.signature(fn).parameters.values())[:-1]
+    wrapper.__signature__ = inspect.Signature(params + [inspect.Parameter(
+        "request", inspect.Parameter.POSITIONAL_OR_KEYWORD, annotation=gr.Request)])
+    keep = {p.name for p in params} | {"return"}
+    wrapper.__annotations__ = {k: v for k, v in fn.__annotations__.items() if k in keep}
+    wrapper.__annotations__["request"] = gr.Request
+    return wrapper
+
+@functools.lru_cache(maxsize=None)  # One wrapper per event, shared by every session
+def handler(event: Event) -> Optional[Callable]:
+    if event.fn is None: return None
+    import executor
+    import metrics
+    fn = resolve(event.fn)
+    if event.session: fn = with_session(fn)
+    if event.offload:
+        options = {} if event.inline_below is None else {"inline_below": event.inline_below}
+        fn = executor.offload(event.offload, fn, **options)
+    return metrics.instrument(fn.__name__, fn)
+
+def _place(item: Any, fields: Dict[str, Field], made: Dict[str, Any], depth: int = 0) -> None:
+    if isinstance(item, str):
+        spec = fields[item]
+        made[item] = getattr(gr, spec.kind)(*spec.args, **spec.kwargs)
+        return
+    with (gr.Row() if depth % 2 == 0 else gr.Column()):
+        for child in item: _place(child, fields, made, depth + 1)
+
+def build(tool: Tool) -> Dict[str, Any]:
+    """Create a tool's components and wire its events (inside the current tab)."""
+    made: Dict[str, Any] = {}
+    # Lazy tools' endpoints come from publish(); their per-session listeners stay off the API
+    visibility = "private" if tool.lazy else "public"
+    with startup.phase(f"build {tool.label}"):
+        for item in tool.layout or tuple(tool.fields): _place(item, tool.fields, made)
+        for event in tool.events:
+            inputs, outputs = [made[n] for n in event.inputs], [made[n] for n in event.outputs]
+            # gr.on without triggers fires on page load (and when its inputs change)
+            if event.trigger == "load": step = gr.on(None, handler(event), inputs, outputs, js=event.js, api_visibility=visibility)
+            else: step = getattr(made[event.source], event.trigger)(handler(event), inputs, outputs, js=event.js, api_visibility=visibility)
+            follow = event.then
+            while follow:
+                step = step.then(handler(follow), [made[n] for n in follow.inputs], [made[n] for n in follow.outputs],
+                                 js=follow.js, api_visibility=visibility)
+                follow = follow.then
+    return made
+
+# Session objects and server file paths cannot come from an API client
+_PRIVATE_KINDS = {"State", "BrowserState", "File"}
+
+def endpoints(tool: Tool) -> Dict[str, Event]:
+    """API name -> event for a tool's stateless server handlers."""
+    found: Dict[str, Event] = {}
+    for event in tool.events:
+        names = event.inputs + event.outputs
+        if event.fn and not any(tool.fields[n].kind in _PRIVATE_KINDS for n in names):
+            found.setdefault(event.fn.rpartition(".")[2], event)
+    for path in tool.api: found.setdefault(path.rpartition(".")[2], Event("", "api", (), (), fn=path))
+    return found
+
+def publish(tool: Tool) -> None:
+    """Register a lazy tool's endpoints once, at build time, under stable names."""
+    for name, event in endpoints(tool).items(): gr.api(handler(event), api_name=name)
+
+def _opened() -> bool:
+    return True
+
+def tab(tool: Tool) -> None:
+    """A gr.Tab for `tool`; lazy tools render on the session's first select."""
+    with gr.Tab(tool.label) as t:
+        if not tool.lazy:
+            build(tool)
+            return
+        opened = gr.State(False)
+        # State.change fires once (False -> True), so each session builds once
+        t.select(_opened, None, opened, queue=False, show_progress="hidden", api_visibility="private")
+
+        @gr.render(inputs=[opened], triggers=[opened.change])
+        def _render(is_open: bool) -> None:
+            if is_open: build(tool)
+
+def tabs(section: str) -> None:
+    for tool in TOOLS:
+        if tool.section != section: continue
+        tab(tool)
+        if tool.lazy: publish(tool)
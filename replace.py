@@ -0,0 +1,198 @@
+"""
+Gardio Replace Engine
+An ordered rule set (literals, regexes, case-insensitive) applied in one pass.
+"""
+import re
+import functools
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+# Pieces of a regex rule that change once it is embedded in the combined pattern
+_GLOBAL_FLAGS = re.compile(r"\(\?([aiLmsux]+)\)")
+_PIECE = re.compile(r"""
+     \\(?:[0-7]{3}|0[0-7]{0,2}|(?P<ref>[1-9][0-9]?)|.)   # Escape; numbered backreference
+    |\[\^?\]?(?:\\.|[^\]\\])*\]                       # Character class
+    |\(\?P<(?P<name>\w+)>                                # Named group
+    |\(\?P=(?P<back>\w+)\)                               # Named backreference
+    |\(\?\((?P<cond>\w+)\)                               # Conditional on a group
+    |[^\\\[(]+|.""", re.X | re.S)
+
+class Rule(NamedTuple):
+    find: str
+    replace: str = ""
+    regex: bool = False
+    ignore_case: bool = False
+
+class Change(NamedTuple):
+    rule: int       # Index into the rule set
+    start: int      # Offsets into the original text
+    end: int
+    old: str
+    new: str
+
+def _trie(words: Iterable[str]) -> str:
+    """Regex matching any of `words`, longest first (the shape of an Aho-Corasick trie)."""
+    root: dict = {}
+    for word in words:
+        node = root
+        for ch in word: node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node: dict) -> str:
+        out = []
+        # Collapse single-child chains iteratively (long literals stay shallow)
+        while len(node) == 1 and "" not in node:
+            (ch, node), = node.items()
+            out.append(re.escape(ch))
+        branches = [(ch, child) for ch, child in sorted(node.items()) if ch]
+        if not branches: return "".join(out)
+        if len(branches) > 1 and all(child.keys() == {""} for _, child in branches):
+            body = "[" + "".join(re.escape(ch) for ch, _ in branches) + "]"
+        else:
+            alts = [re.escape(ch) + emit(child) for ch, child in branches]
+            body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        if "" in node: body = f"(?:{body})?"  # Greedy: prefer the longer literal
+        return "".join(out) + body
+
+    return emit(root)
+
+def _embed(find: str, tag: str, base: int) -> str:
+    """Rewrite a regex so it can sit in an alternation after `base` groups.
+
+    Group names get the `tag` prefix (two rules may both use `(?P<n>...)`),
+    numbered references are shifted by `base`, and leading global flags,
+    which re only accepts at the very start, become a scoped group.
+    """
+    flags, pos = "", 0
+    m = _GLOBAL_FLAGS.match(find)
+    while m:
+        flags, pos = flags + m.group(1), m.end()
+        m = _GLOBAL_FLAGS.match(find, pos)
+    out = []
+    for m in _PIECE.finditer(find, pos):
+        if m.group("ref"):
+            n = base + int(m.group("ref"))
+            if n > 99: raise ValueError(f"backreference \\{m.group('ref')} exceeds group 99 once rules are combined")
+            out.append(f"(?:\\{n})")
+        elif m.group("name"): out.append(f"(?P<{tag}{m.group('name')}>")
+        elif m.group("back"): out.append(f"(?P={tag}{m.group('back')})")
+        elif m.group("cond"):
+            ref = m.group("cond")
+            out.append(f"(?({base + int(ref) if ref.isdigit() else tag + ref})")
+        else: out.append(m.group())
+    source = "".join(out)
+    # A verbose-mode comment would swallow the closing paren without the newline
+    return f"(?{flags}:{source}{chr(10) if 'x' in flags else ''})" if flags else source
+
+class RuleSet:
+    """Rules compiled into one pattern and applied in a single left-to-right scan.
+
+    At each position the first rule (in order) that matches claims the span;
+    replaced text is never rescanned, so rules do not cascade. Consecutive
+    literal rules with the same case mode share one trie-shaped group: a
+    literal shadowed by an earlier rule that is its prefix can never match
+    and is dropped, so longest-first within the trie equals rule order.
+    """
+
+    def __init__(self, rules: Sequence[Rule]) -> None:
+        self.rules = tuple(rules)
+        if not self.rules: raise ValueError("No rules")
+        self._standalone: Dict[int, "re.Pattern"] = {}
+        inner: Dict[int, int] = {}   # Regex rule -> its own capture group count
+        groups: List[Tuple[bool, List[int]]] = []   # (literal run?, rule indices)
+        for i, rule in enumerate(self.rules):
+            if not rule.find: raise ValueError(f"Rule {i + 1}: empty pattern")
+            if not rule.regex:
+                prev = groups[-1] if groups else None
+                if prev and prev[0] and self.rules[prev[1][0]].ignore_case == rule.ignore_case: prev[1].append(i)
+                else: groups.append((True, [i]))
+                continue
+            try: standalone = re.compile(rule.find, re.IGNORECASE if rule.ignore_case else 0)
+            except re.error as e: raise ValueError(f"Rule {i + 1}: {e}") from None
+            inner[i] = standalone.groups
+            if standalone.groups and "\\" in rule.replace: self._standalone[i] = standalone
+            groups.append((False, [i]))
+
+        parts, self._lookup, base = [], [], 0
+        for g, (literal, members) in enumerate(groups):
+            ignore_case = self.rules[members[0]].ignore_case
+            base += 1   # The _g wrapper group
+            if literal:
+                table: Dict[str, int] = {}
+                for i in members:
+                    key = self.rules[i].find.lower() if ignore_case else self.rules[i].find
+                    if not any(key.startswith(k) for k in table): table.setdefault(key, i)
+                source = _trie(table)
+                self._lookup.append(table)
+            else:
+                i = members[0]
+                try: source = _embed(self.rules[i].find, f"_r{i}_", base)
+                except ValueError as e: raise ValueError(f"Rule {i + 1}: {e}") from None
+                base += inner[i]
+                self._lookup.append(i)
+            parts.append(f"(?P<_g{g}>{'(?i:' + source + ')' if ignore_case else source})")
+        try: self.pattern = re.compile("|".join(parts))
+        except re.error as e:
+            # Name the rule whose part holds the error position
+            end, g = 0, 0
+            for g, part in enumerate(parts):
+                end += len(part) + 1
+                if e.pos is None or e.pos < end: break
+            raise ValueError(f"Rule {groups[g][1][0] + 1}: {e.msg}") from None
+        self._groups = {self.pattern.groupindex[f"_g{g}"]: self._lookup[g] for g in range(len(groups))}
+
+    def _rule(self, m: "re.Match") -> int:
+        found = self._groups[m.lastindex]
+        if isinstance(found, int): return found
+        text = m.group()
+        if text in found: return found[text]
+        key = text.lower()
+        if key in found: return found[key]
+        # Case folds that str.lower() and re disagree on
+        return min(i for k, i in found.items() if re.fullmatch(re.escape(k), text, re.IGNORECASE))
+
+    def _expand(self, i: int, m: "re.Match") -> str:
+        rule = self.rules[i]
+        if i in self._standalone: return self._standalone[i].match(m.string, m.start()).expand(rule.replace)
+        if rule.regex and "\\" in rule.replace: return m.expand(rule.replace)  # Escapes only (\n, \t)
+        return rule.replace
+
+    def changes(self, text: str) -> Iterator[Change]:
+        """Yield each replacement with its offsets (preview mode)."""
+        for m in self.pattern.finditer(text):
+            i = self._rule(m)
+            yield Change(i, m.start(), m.end(), m.group(), self._expand(i, m))
+
+    def apply(self, text: str) -> Tuple[str, List[int]]:
+        """Return (new text, hits per rule)."""
+        hits = [0] * len(self.rules)
+        groups, rules, rule, expand = self._groups, self.rules, self._rule, self._expand
+
+        def repl(m: "re.Match") -> str:
+            # Fast path: exact-case literal hit needs one dict lookup
+            i = groups[m.lastindex].get(m.group()) if type(groups[m.lastindex]) is dict else None
+            if i is None:
+                i = rule(m)
+                hits[i] += 1
+                return expand(i, m)
+            hits[i] += 1
+            return rules[i].replace
+
+        return self.pattern.sub(repl, text), hits
+
+@functools.lru_cache(maxsize=64)
+def compile_rules(rules: Tuple[Rule, ...]) -> RuleSet:
+    return RuleSet(rules)
+
+def parse_rows(rows: Optional[Iterable[Sequence]]) -> List[Rule]:
+    """Rules from table rows [find, replace, regex, ignore case]; blank rows are skipped."""
+    rules = []
+    for row in rows or ():
+        row = list(row) + [""] * (4 - len(row))
+        find = "" if row[0] is None else str(row[0])
+        if not find: continue
+        rules.append(Rule(find, "" if row[1] is None else str(row[1]), _flag(row[2]), _flag(row[3])))
+    return rules
+
+def _flag(value) -> bool:
+    if isinstance(value, str): return value.strip().lower() in ("true", "yes", "y", "1", "x", "✓")
+    return bool(value)
@@ -0,0 +1,39 @@
+"""
+Gardio Startup
+Deferred imports and a cold-start profile (phase timings and modules loaded).
+"""
+import sys
+import time
+import importlib.util
+from contextlib import contextmanager
+from typing import Dict, Iterator, Tuple
+
+_STARTED = time.perf_counter()
+PHASES: Dict[str, Tuple[float, int]] = {}   # phase -> (seconds, modules imported), first run only
+
+def lazy_import(name: str):
+    """Module object that is only executed on first attribute access."""
+    if name in sys.modules: return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+def preload(*names: str) -> None:
+    """Execute deferred modules now (e.g. in pool workers, before the first job)."""
+    for name in names: getattr(importlib.import_module(name), "__name__")
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    start, modules = time.perf_counter(), len(sys.modules)
+    try: yield
+    finally: PHASES.setdefault(name, (time.perf_counter() - start, len(sys.modules) - modules))
+
+def report() -> str:
+    lines = [f"{'phase':<32} {'ms':>9} {'modules':>8}"]
+    for name, (seconds, modules) in PHASES.items(): lines.append(f"{name:<32} {seconds * 1000:9.1f} {modules:8d}")
+    lines.append(f"{'since startup.py import':<32} {(time.perf_counter() - _STARTED) * 1000:9.1f} {len(sys.modules):8d}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,110 @@
+"""
+Gardio Statistics Engine
+Text statistics shared by Analytics & Frequency, on C-level str/regex paths.
+"""
+import heapq
+import re
+from collections import Counter
+from typing import Iterable, Iterator, List, Tuple
+
+from constants import STOP_WORDS, STATS_CHUNK_SIZE, WORDS_PER_MINUTE
+
+RE_PUNCT = re.compile(r'[^\w\s]')
+_strip_punct = RE_PUNCT.sub
+_LINE_BREAKS = "\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+
+def _rank(item: Tuple[str, int]) -> Tuple[int, str]:
+    return -item[1], item[0]
+
+class TextStats:
+    """Running totals for characters, words, lines and keyword frequency."""
+    __slots__ = ("chars", "words", "lines", "letters", "freq", "keywords")
+
+    def __init__(self) -> None:
+        self.chars = 0
+        self.words = 0
+        self.lines = 0
+        self.letters = 0
+        self.freq: Counter = Counter()
+        self.keywords = 0
+
+    @property
+    def avg_len(self) -> float:
+        return self.letters / self.words if self.words else 0
+
+    @property
+    def read_time(self) -> float:
+        return round(self.words / WORDS_PER_MINUTE, 1)
+
+    def top(self, n: int = 5) -> List[Tuple[str, int]]:
+        """Top-n keywords; ties break alphabetically so results are order-independent."""
+        return heapq.nsmallest(n, self.freq.items(), key=_rank)
+
+    def add_text(self, text: str, keywords: bool = False) -> None:
+        """Fold whole lines of text into the totals; keyword counts only on request."""
+        words = text.split()
+        self.chars += len(text)
+        self.lines += len(text.splitlines())
+        self.words += len(words)
+        self.letters += sum(map(len, words))
+        if keywords: self.add_keywords(text)
+
+    def add_keywords(self, text: str) -> None:
+        """Fold text into the keyword frequencies only."""
+        freq = keyword_counts(text)
+        self.freq.update(freq)
+        self.keywords += sum(freq.values())
+
+    def apply(self, words: int, letters: int, freq: Counter, sign: int = 1) -> None:
+        self.words += sign * words
+        self.letters += sign * letters
+        self.keywords += sign * sum(freq.values())
+        if sign > 0: self.freq.update(freq)
+        else: self.freq.subtract(freq)
+
+def keyword_counts(text: str) -> Counter:
+    """Lowercased, punctuation-stripped words of 2+ characters, minus STOP_WORDS."""
+    freq = Counter(_strip_punct('', text.lower()).split())
+    # Filter distinct words, not every occurrence
+    for word in [w for w in freq if len(w) < 2 or w in STOP_WORDS]: del freq[word]
+    return freq
+
+_NO_KEYWORDS: Counter = Counter()
+
+def tokenize_line(line: str, keywords: bool = True) -> Tuple[int, int, Counter]:
+    """Split a line once, returning (word_count, letter_count, keyword_counts)."""
+    words = line.split()
+    return len(words), sum(map(len, words)), keyword_counts(line) if keywords else _NO_KEYWORDS
+
+def scan(text: str, keywords: bool = False) -> TextStats:
+    """Compute statistics for an in-memory string; `keywords` also counts frequencies."""
+    stats = TextStats()
+    stats.add_text(text, keywords)
+    return stats
+
+def iter_chunks(text: str, size: int = STATS_CHUNK_SIZE) -> Iterator[str]:
+    for i in range(0, len(text), size):
+        yield text[i:i + size]
+
+def iter_blocks(chunks: Iterable[str]) -> Iterator[str]:
+    """Re-cut arbitrary chunks into runs of complete lines (ends kept)."""
+    pending = ""
+    for chunk in chunks:
+        if not chunk: continue
+        text = pending + chunk
+        # Cut after the last line break, holding back a trailing '\r' that may precede '\n'
+        end = len(text) - (text[-1] == "\r")
+        cut = max(text.rfind(c, 0, end) for c in _LINE_BREAKS) + 1
+        pending = text[cut:]
+        if cut: yield text[:cut]
+    if pending: yield pending
+
+def scan_chunks(chunks: Iterable[str], keywords: bool = False) -> TextStats:
+    """Compute statistics over a stream of text chunks without joining them.
+
+    Unlike the textbox tools, no character cap is applied; memory stays
+    bounded by one chunk plus the longest line and the keyword table.
+    """
+    stats = TextStats()
+    for block in iter_blocks(chunks): stats.add_text(block, keywords)
+    return stats
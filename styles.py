@@ -19,4 +19,12 @@ button.primary{background:var(--gradient)!important;border:none!important;border
 .chatbot{height:400px!important}
 .empty-state,.error-state{padding:20px;text-align:center;border-radius:10px;background:var(--glass);border:1px solid var(--border);color:var(--text);font-weight:600}
 .error-state{border-color:#ef4444;color:#ef4444}
+.diff-panel{max-height:480px;overflow:auto;border-radius:10px;background:var(--glass);border:1px solid var(--border)}
+.diff-table{width:100%;border-collapse:collapse;font-family:ui-monospace,monospace;font-size:0.8rem;table-layout:fixed}
+.diff-table td{padding:1px 6px;white-space:pre-wrap;word-break:break-all;vertical-align:top}
+.diff-num{width:48px;color:#6b7280;text-align:right;user-select:none}
+.diff-del{background:rgba(239,68,68,0.15)}
+.diff-add{background:rgba(34,197,94,0.15)}
+.diff-hunk td{color:var(--accent2);background:rgba(6,182,212,0.08)}
+.diff-note{margin:0;padding:6px 10px;color:#94a3b8;font-size:0.75rem}
 """